@@ -1,5 +1,8 @@
+#include <algorithm>
+#include <cstdint>
 #include <fstream>
 #include <iostream>
+#include <string_view>
 
 #include "./nlohmann/json.hpp"
 
@@ -7,6 +10,42 @@
 #include "./modules/Solver/Solver.hpp"
 
 const std::string CONFIG_FILEPATH = "./config/params.json";
+const std::string BINARY_FILEPATH = "./config/params.bin";
+
+// version 1 of the puzzle file the visualizer maps, see visualizer/modules/puzzle_file.py
+void write_puzzle_file(const std::string& filepath, const std::vector<std::vector<int>>& board, const std::vector<int>& codes, int states) {
+    std::ofstream ofs(filepath, std::ios::binary);
+    auto write = [&ofs](std::uint64_t value, int size) {
+        for (int i = 0; i < size; i++) {
+            ofs.put(static_cast<char>((value >> (i * 8)) & 0xff));
+        }
+    };
+
+    int height = board.size();
+    int width = board[0].size();
+    int move_size = codes.empty() || std::ranges::max(codes) < (1 << 8) ? 1 : 2;
+
+    // header: magic, version, height, width, move size, puzzle count, offset of every puzzle
+    ofs.write("SPZL", 4);
+    write(1, 2);
+    write(height, 1);
+    write(width, 1);
+    write(move_size, 1);
+    write(1, 4);
+    write(4 + 2 + 1 + 1 + 1 + 4 + 8, 8);
+
+    // record: steps, states, board as signed bytes, a code per move
+    write(codes.size(), 4);
+    write(states, 8);
+    for (const auto& row : board) {
+        for (const auto& elem : row) {
+            write(static_cast<std::uint8_t>(elem), 1);
+        }
+    }
+    for (const auto& code : codes) {
+        write(code, move_size);
+    }
+}
 
 int main() {
     std::ifstream ifs(CONFIG_FILEPATH);
@@ -67,9 +106,11 @@ int main() {
         i++;
     }
     std::string zero_indexed_process;
+    std::vector<int> codes;
     for (std::size_t i = 0; i < block_ids.size(); i++) {
         zero_indexed_process += std::to_string(block_ids[i] - 1);
         zero_indexed_process += dirs[i];
+        codes.push_back((block_ids[i] - 1) * 4 + std::string_view("UDRL").find(dirs[i]));
     }
 
     config["output"] = zero_indexed_shuffled_board;
@@ -79,4 +120,8 @@ int main() {
 
     std::ofstream ofs(CONFIG_FILEPATH);
     ofs << config.dump(4) << std::endl;
+    ofs.close();
+
+    // written after params.json so the visualizer sees it as the newer of the two
+    write_puzzle_file(BINARY_FILEPATH, zero_indexed_shuffled_board, codes, states);
 }
\ No newline at end of file
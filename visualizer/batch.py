@@ -0,0 +1,119 @@
+import argparse
+import json
+import logging
+import multiprocessing
+from pathlib import Path
+import sys
+import time
+
+import modules.config
+import modules.pattern_database
+import modules.puzzle_file
+import modules.solving_worker
+
+CONFIG_FILEPATH = str(Path(__file__).resolve().parent / 'config' / 'config.json')
+# the parallel search starts processes of its own, which pool workers are not allowed to do
+METHODS = ('bfs', 'bidirectional', 'astar', 'idastar', 'numpy', 'external')
+
+# state of a pool worker, set up once by _init_process
+_config = None
+_method = None
+_budgets = None
+# pattern databases built by this worker, puzzles of one layout share theirs
+_pattern_databases = dict()
+
+
+def _init_process(config: dict, method: str, budgets: tuple):
+    global _config, _method, _budgets
+    _config = config
+    _method = method
+    _budgets = budgets
+
+
+def _solve(task: tuple) -> dict:
+    # task: (line number, json line), a puzzle without block types or goal takes them from the config,
+    # the board may also be given as the "output" of params.json and generate.py
+    line_num, line = task
+    start = time.perf_counter()
+    try:
+        puzzle = json.loads(line)
+        board = puzzle['board'] if 'board' in puzzle else puzzle['output']
+        block_types = puzzle.get('block_types', _config['block_types'])
+        goal = puzzle.get('goal', _config['goal'])
+        solver, backend = modules.solving_worker.create_solver(board, block_types, goal, _method, None, None, None, _config['solver']['memory'] * 1024 * 1024)
+        if _method in ('astar', 'idastar'):
+            solver.set_pattern_database(_get_pattern_database(solver, board, block_types, goal))
+        steps, process = solver.solve(board, _method, *_budgets) if backend is None else backend.solve(board)
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+        return {'id': line_num, 'error': f'{type(e).__name__}: {e}'}
+    return {
+        'id': puzzle.get('id', line_num),
+        'steps': steps,
+        'process': process,
+        'states': (solver if backend is None else backend).get_states(),
+        'seconds': time.perf_counter() - start,
+        # the process only leads towards the goal when a budget ran out
+        'partial': backend is None and solver.is_partial(),
+    }
+
+
+def _get_pattern_database(solver, board: list, block_types: list, goal: dict):
+    # the signature does not tell which blocks are of the pattern types, so the block types are part of the key
+    key = (solver.get_signature(), tuple(block_types), tuple(goal.keys()))
+    if key not in _pattern_databases:
+        _pattern_databases[key] = modules.pattern_database.PatternDatabase(board, block_types, goal, _config['solver']['pattern'])
+    return _pattern_databases[key]
+
+
+def read(f):
+    for line_num, line in enumerate(f):
+        if line.strip() != '':
+            yield (line_num, line)
+
+
+def read_binary(filepath: str):
+    # puzzles of a puzzle file are handed to the workers as json lines too
+    with modules.puzzle_file.PuzzleFile(filepath) as puzzle_file:
+        for idx in range(len(puzzle_file)):
+            yield (idx, json.dumps({'board': puzzle_file.get_board(idx)}))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='solves json lines of puzzles and writes a json line per answer as soon as it is found.')
+    parser.add_argument('input', nargs='?', help='json lines file of {"board" or "output", "block_types", "goal", "id"}, or puzzle file ending with .bin, stdin by default')
+    parser.add_argument('-o', '--output', help='json lines file the answers are written to, stdout by default')
+    parser.add_argument('-m', '--method', choices=METHODS, default='bfs')
+    parser.add_argument('-w', '--workers', type=int, help='processes solving puzzles, one per cpu core by default')
+    parser.add_argument('-t', '--time-limit', type=float, help='seconds a puzzle is searched before the way towards the closest state is written')
+    parser.add_argument('-n', '--node-limit', type=int, help='states a puzzle is searched for before the way towards the closest state is written')
+    parser.add_argument('--memory-limit', type=int, help='megabytes a search may hold before the way towards the closest state is written')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    memory_limit = None if args.memory_limit is None else args.memory_limit * 1024 * 1024
+    budgets = (args.time_limit, args.node_limit, memory_limit)
+    if args.method in ('numpy', 'external') and any([budget is not None for budget in budgets]):
+        logging.warning(f'the {args.method} search runs without budgets.')
+
+    config = modules.config.load(CONFIG_FILEPATH)
+    is_binary = args.input is not None and args.input.endswith('.bin')
+    input_file = sys.stdin if args.input is None or is_binary else open(args.input, 'r')
+    output_file = sys.stdout if args.output is None else open(args.output, 'w')
+
+    start = time.perf_counter()
+    count, failure_count, partial_count = 0, 0, 0
+    with multiprocessing.Pool(args.workers, initializer=_init_process, initargs=(config, args.method, budgets)) as pool:
+        for result in pool.imap_unordered(_solve, read_binary(args.input) if is_binary else read(input_file)):
+            output_file.write(json.dumps(result) + '\n')
+            output_file.flush()
+            count += 1
+            failure_count += 'error' in result
+            partial_count += result.get('partial', False)
+
+    seconds = time.perf_counter() - start
+    logging.info(f'{count} puzzles ({failure_count} failed, {partial_count} partial) are solved in {seconds:.2f}s, {count / seconds * 3600:.0f} puzzles per hour.')
+    if input_file is not sys.stdin:
+        input_file.close()
+    if output_file is not sys.stdout:
+        output_file.close()
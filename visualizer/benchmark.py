@@ -0,0 +1,116 @@
+import argparse
+import cProfile
+import json
+import logging
+from pathlib import Path
+import platform
+import sys
+import time
+import tracemalloc
+
+import modules.config
+import modules.solving_worker
+
+CONFIG_FILEPATH = str(Path(__file__).resolve().parent / 'config' / 'config.json')
+CORPUS_FILEPATH = str(Path(__file__).resolve().parent / 'config' / 'benchmark.json')
+METHODS = ('bfs', 'bidirectional', 'astar', 'idastar', 'parallel', 'numpy', 'external')
+
+
+def run(layout: dict, method: str, solver_config: dict, repeat: int, profile_dirpath: str = None) -> dict:
+    board, block_types, goal = layout['board'], layout['block_types'], layout['goal']
+    pattern_types = solver_config['pattern'] if method in ('astar', 'idastar') else None
+
+    start = time.perf_counter()
+    solver, backend = modules.solving_worker.create_solver(board, block_types, goal, method, pattern_types, None, solver_config['workers'], solver_config['memory'] * 1024 * 1024)
+    setup_seconds = time.perf_counter() - start
+
+    def solve() -> tuple:
+        return solver.solve(board, method) if backend is None else backend.solve(board)
+
+    # the fastest of the runs, the others only add scheduling noise
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        steps, _ = solve()
+        seconds = min(seconds, time.perf_counter() - start)
+    stats = (solver if backend is None else backend).get_stats()
+
+    # tracing slows the search down, so memory is measured in a run of its own
+    tracemalloc.start()
+    solve()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    if profile_dirpath is not None:
+        profile = cProfile.Profile()
+        profile.runcall(solve)
+        profile.dump_stats(str(Path(profile_dirpath) / f'{layout["name"]}-{method}.prof'))
+
+    if method == 'parallel':
+        backend.close()
+    return {
+        'layout': layout['name'],
+        'method': method,
+        'steps': steps,
+        'optimal': layout.get('steps', steps) == steps,
+        'states': stats['states'],
+        'expanded': stats['expanded'],
+        'peak_frontier': stats['peak_frontier'],
+        'setup_seconds': setup_seconds,
+        'seconds': seconds,
+        'states_per_second': stats['states'] / max(seconds, 1e-9),
+        'peak_memory': peak_memory,
+    }
+
+
+def compare(results: list, baseline_filepath: str):
+    with open(baseline_filepath, 'r') as f:
+        baseline = {(result['layout'], result['method']): result for result in json.load(f)['results']}
+    for result in results:
+        old = baseline.get((result['layout'], result['method']))
+        if old is None:
+            continue
+        logging.info(f'{result["layout"]:>14} {result["method"]:>13}: {result["seconds"] / old["seconds"]:.2f}x time, {result["peak_memory"] / max(old["peak_memory"], 1):.2f}x memory')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='solves a corpus of layouts with every solving method and reports how fast they are.')
+    # idastar searches every depth again up to the answer, which takes minutes on the klotski layouts
+    parser.add_argument('-m', '--methods', nargs='+', choices=METHODS, default=[method for method in METHODS if method != 'idastar'])
+    parser.add_argument('-l', '--layouts', nargs='+', help='names of the layouts to solve, all of them by default')
+    parser.add_argument('-c', '--corpus', default=CORPUS_FILEPATH)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', help='json file the results are written to')
+    parser.add_argument('-b', '--baseline', help='json file of earlier results to compare with')
+    parser.add_argument('-p', '--profile', help='directory cProfile stats of every run are written to')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    solver_config = modules.config.load(CONFIG_FILEPATH)['solver']
+    layouts = modules.config.load(args.corpus)['layouts']
+    if args.layouts is not None:
+        layouts = [layout for layout in layouts if layout['name'] in args.layouts]
+    if args.profile is not None:
+        Path(args.profile).mkdir(parents=True, exist_ok=True)
+
+    results = list()
+    for layout in layouts:
+        for method in args.methods:
+            results.append(run(layout, method, solver_config, args.repeat, args.profile))
+            result = results[-1]
+            logging.info(
+                f'{result["layout"]:>14} {result["method"]:>13}: {result["steps"]} steps, {result["states"]} states, '
+                f'{result["seconds"]:.3f}s, {result["states_per_second"]:.0f} states/s, {result["peak_memory"] / 1024 / 1024:.1f}MiB'
+            )
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(), 'results': results}, f, indent=4)
+    if args.baseline is not None:
+        compare(results, args.baseline)
+
+    wrong = [f'{result["layout"]} {result["method"]}' for result in results if not result['optimal']]
+    if len(wrong) > 0:
+        logging.error(f'the answers of {", ".join(wrong)} are not optimal.')
+    sys.exit(1 if len(wrong) > 0 else 0)
@@ -0,0 +1,43 @@
+import argparse
+import json
+import logging
+from pathlib import Path
+import time
+
+import modules.config
+import modules.generator
+import modules.puzzle_file
+
+CONFIG_FILEPATH = str(Path(__file__).resolve().parent / 'config' / 'config.json')
+BOARD_FILEPATH = str(Path(__file__).resolve().parents[1] / 'config' / 'params.json')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='generates layouts of the configured blocks whose answer is a given number of moves long.')
+    parser.add_argument('-d', '--distance', type=int, help='moves of the answer, the farthest layouts from the goal by default')
+    parser.add_argument('-n', '--num', type=int, default=1)
+    parser.add_argument('-s', '--seed', type=int)
+    parser.add_argument('-o', '--output', help='json lines file, or puzzle file when it ends with .bin, the layouts are written to, by default the first one replaces the board of params.json')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    config = modules.config.load(CONFIG_FILEPATH)
+    start = time.perf_counter()
+    generator = modules.generator.Generator(config['board'], config['block_types'], config['goal'], args.seed)
+    puzzles = generator.generate(args.distance, args.num)
+    steps = [puzzle['steps'] for puzzle in puzzles]
+    logging.info(f'{len(puzzles)} layouts of {min(steps, default=None)} to {max(steps, default=None)} moves are generated in {time.perf_counter() - start:.2f}s.')
+
+    if args.output is not None and args.output.endswith('.bin'):
+        modules.puzzle_file.PuzzleFile.write(args.output, puzzles)
+    elif args.output is not None:
+        with open(args.output, 'w') as f:
+            for puzzle in puzzles:
+                f.write(json.dumps(puzzle) + '\n')
+    elif len(puzzles) > 0:
+        # the same keys main.cpp writes, so the visualizer picks the layout up as it is
+        with open(BOARD_FILEPATH, 'r') as f:
+            params = json.load(f)
+        params.update(puzzles[0])
+        with open(BOARD_FILEPATH, 'w') as f:
+            f.write(json.dumps(params, indent=4) + '\n')
@@ -1,31 +1,39 @@
-import json
-# import logging
+import logging
 from pathlib import Path
 import pygame
-import re
 import sys
+import time
 
 import modules.board
+import modules.config
 import modules.gradator
+import modules.puzzle_file
 
 
 class App:
 
     CONFIG_FILEPATH = str(Path(__file__).resolve().parents[1] / 'config' / 'config.json')
     BOARD_FILEPATH = str(Path(__file__).resolve().parents[2] / 'config' / 'params.json')
+    BINARY_BOARD_FILEPATH = str(Path(__file__).resolve().parents[2] / 'config' / 'params.bin')
+    PATTERN_DATABASE_FILEPATH = str(Path(__file__).resolve().parents[1] / 'config' / 'pattern.db')
+    SOLUTION_CACHE_FILEPATH = str(Path(__file__).resolve().parents[2] / 'config' / 'solutions.sqlite3')
+    DISTANCE_TABLE_FILEPATH = str(Path(__file__).resolve().parents[1] / 'config' / 'distances.bin')
+
+    def __init__(self, start_time: float = None, trace_filepath: str = None, board_info: dict = None, use_caches: bool = True):
+        # start_time: time.perf_counter() at launch, the time to the first frame is measured from it,
+        # trace_filepath: file the input of every frame is recorded to for replay.py,
+        # board_info: the keys of params.json, loaded from params.bin or params.json when not given,
+        # use_caches: False keeps the solution cache in memory and leaves out the distance table, so that nothing of an earlier run is reused
+        start_time = time.perf_counter() if start_time is None else start_time
 
-    def __init__(self):
         # init pygame
         pygame.init()
         pygame.display.set_caption('Visualizer')
 
         # load config
-        with open(self.CONFIG_FILEPATH, 'r') as f:
-            text = f.read()
-        config = json.loads(re.sub(r'/\*[\s\S]*?\*/|//.*', '', text))
-        with open(self.BOARD_FILEPATH, 'r') as f:
-            text = f.read()
-        board_info = json.loads(re.sub(r'/\*[\s\S]*?\*/|//.*', '', text))
+        config = modules.config.load(self.CONFIG_FILEPATH)
+        board_info = self.__load_board_info() if board_info is None else board_info
+        self.__recorder = None if trace_filepath is None else self.__get_recorder(trace_filepath, board_info)
         
         self.__fps = config['fps']
         self.__tile_size = tuple(config['tile_size'].values())
@@ -43,6 +51,13 @@ class App:
         self.__surface.fill(config['color']['bg'])
         self.__dirty_rects = list()
 
+        # solving progress is shown in the bottom padding
+        self.__font = pygame.font.SysFont(config['font'], config['font_size'])
+        self.__bg_color = config['color']['bg']
+        self.__text_color = config['color']['text']
+        self.__progress_rect = pygame.Rect(self.__padding[0], screen_height - self.__padding[1], screen_width - self.__padding[0] * 2, self.__padding[1])
+        self.__progress_text = ''
+
         self.__cursor = {  # [y, x]
             pygame.MOUSEMOTION: [-1, -1],
             pygame.MOUSEBUTTONDOWN: [-1, -1],
@@ -82,23 +97,33 @@ class App:
             self.__padding,
             block_gap=config['gap'],
             corner_radius=config['radius'],
-            moving_speed=config['speed']
+            moving_speed=config['speed'],
+            playback_rate=config['playback'],
+            solving_method=config['solver']['method'],
+            pattern_types=config['solver']['pattern'],
+            pattern_filepath=self.PATTERN_DATABASE_FILEPATH,
+            solution_cache_size=config['solver']['cache'],
+            solution_cache_filepath=self.SOLUTION_CACHE_FILEPATH if use_caches else ':memory:',
+            distance_table_filepath=self.DISTANCE_TABLE_FILEPATH if use_caches else None,
+            parallel_worker_num=config['solver']['workers'],
+            memory_limit=config['solver']['memory'] * 1024 * 1024,
+            time_limit=config['solver']['time_limit'],
+            fast_start=config['fast_start'],
         )
 
         self.__clock = pygame.time.Clock()
         print('game starts.')
         pygame.display.update()
+        logging.info(f'first frame is drawn in {(time.perf_counter() - start_time) * 1000:.0f}ms.')
 
     def run(self):
         while (True):
             self.__mainloop()
 
-    def __mainloop(self):
-        pygame.display.update(self.__dirty_rects)
-        self.__dirty_rects.clear()
-
+    def step(self, events: list, elapsed: float) -> tuple:
+        # one frame of the given events, (seconds Board.update took, dirty rects, dirty pixels) of it
         cursor, event_type, key = None, None, None
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.MOUSEMOTION:
                 self.__cursor[pygame.MOUSEMOTION][0], self.__cursor[pygame.MOUSEMOTION][1] = event.pos[1], event.pos[0]
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -120,14 +145,66 @@ class App:
             if event.type == pygame.QUIT:
                 self.__quit()
 
-        self.__board.update(self.__surface, self.__dirty_rects, cursor, event_type, key)
+        start = time.perf_counter()
+        self.__board.update(self.__surface, self.__dirty_rects, cursor, event_type, key, elapsed)
+        update_seconds = time.perf_counter() - start
+        self.__draw_progress()
+
+        stats = (update_seconds, len(self.__dirty_rects), sum([rect.width * rect.height for rect in self.__dirty_rects]))
+        pygame.display.update(self.__dirty_rects)
+        self.__dirty_rects.clear()
+        return stats
+
+    def wait(self):
+        # blocks until a requested answer is found, a replay gets it on the next frame however fast the machine is
+        self.__board.wait()
+
+    def __mainloop(self):
+        events = pygame.event.get()
+        elapsed = self.__clock.get_time()
+        if self.__recorder is not None:
+            self.__recorder.record(elapsed, events)
+        self.step(events, elapsed)
         # logging.debug(f'fps: {self.__clock.get_fps():.2f}')
         self.__clock.tick(self.__fps)
 
+    def __load_board_info(self) -> dict:
+        # main.cpp writes params.bin next to params.json, which stays the fallback when the binary file is missing or older
+        binary_path, json_path = Path(self.BINARY_BOARD_FILEPATH), Path(self.BOARD_FILEPATH)
+        if binary_path.exists() and (not json_path.exists() or binary_path.stat().st_mtime >= json_path.stat().st_mtime):
+            with modules.puzzle_file.PuzzleFile(self.BINARY_BOARD_FILEPATH) as puzzle_file:
+                return puzzle_file.get(0)
+        return modules.config.load(self.BOARD_FILEPATH)
+
+    def __get_recorder(self, trace_filepath: str, board_info: dict):
+        # imported here so that a launch without recording never imports json
+        import modules.trace
+        return modules.trace.TraceRecorder(trace_filepath, board_info)
+
+    def close(self):
+        if self.__recorder is not None:
+            self.__recorder.close()
+        self.__board.close()
+
     def __quit(self):
+        self.close()
         pygame.quit()
         sys.exit()
 
+    def __draw_progress(self):
+        progress = self.__board.get_progress()
+        text = '' if progress is None else f'solving... states: {progress[0]}, queue: {progress[1]}' + (f', depth: {progress[2]}' if progress[2] > 0 else '')
+        if text == self.__progress_text:
+            return
+        self.__progress_text = text
+
+        self.__dirty_rects.append(self.__progress_rect)
+        self.__surface.fill(self.__bg_color, self.__progress_rect)
+        if text == '':
+            return
+        text_surface = self.__font.render(text, True, self.__text_color)
+        self.__surface.blit(text_surface, (self.__progress_rect.left, self.__progress_rect.top + (self.__progress_rect.height - text_surface.get_height()) // 2))
+
     def __get_direction(self, key: int = None) -> int:
         if key in (pygame.K_UP, pygame.K_w):
             return pygame.K_UP
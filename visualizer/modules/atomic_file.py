@@ -0,0 +1,17 @@
+import contextlib
+import os
+
+
+@contextlib.contextmanager
+def open_atomic(filepath: str):
+    # the file is written under a temporary name and only renamed to filepath once it is complete,
+    # so a reader, a memory map of a running visualizer among them, never sees it half-written
+    tmp_filepath = filepath + '.tmp'
+    try:
+        with open(tmp_filepath, 'wb') as f:
+            yield f
+        os.replace(tmp_filepath, filepath)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_filepath)
+        raise
@@ -1,8 +1,12 @@
 import copy
 import logging
+import os
 import pygame
 
 import modules.block
+import modules.move_table
+import modules.scheduler
+import modules.sprite_cache
 
 
 class Board:
@@ -26,128 +30,97 @@ class Board:
         'L': pygame.K_LEFT,
     }
 
-    def __init__(self, board: list, process: str, steps: int, block_types: list, goal: dict, tile_size: tuple, block_colors: list, surface: pygame.Surface, drawing_top_left: tuple, block_gap: int, corner_radius: int, moving_speed: int = 1):
+    def __init__(self, board: list, process: str, steps: int, block_types: list, goal: dict, tile_size: tuple, block_colors: list, surface: pygame.Surface, drawing_top_left: tuple, block_gap: int, corner_radius: int, moving_speed: float = 1, playback_rate: float = None, solving_method: str = 'bfs', pattern_types: list = None, pattern_filepath: str = None, solution_cache_size: int = None, solution_cache_filepath: str = None, distance_table_filepath: str = None, parallel_worker_num: int = None, memory_limit: int = None, time_limit: float = None, fast_start: bool = False):
         self.__init_board = copy.deepcopy(board)
         self.__board = board
-        self.__goal_block = int(list(goal.keys())[0])
-        self.__goal_coords = list(goal.values())[0]
 
         self.__block_num = max([max(idxs) for idxs in board]) + 1
         self.__blocks = [modules.block.Block() for _ in range(self.__block_num)]
 
+        # the legal moves are kept up to date move by move on the same tables the solver is built from
+        self.__col_num = len(board[0])
+        self.__move_table = modules.move_table.MoveTable(board)
+        self.__key2dir = {key: modules.move_table.MoveTable.DIR_CHARS.index(char) for key, char in self.ENUM2CHAR.items()}
+        self.__legal_moves = None
+
         self.__tile_size = tile_size
         self.__gap = int(block_gap * tile_size[0] / 32)
         self.__radius = corner_radius
+        self.__sprites = modules.sprite_cache.SpriteCache()
         self.__bg_color = block_colors[-1]
 
         self.__top_left = drawing_top_left
         self.__width = len(board[0]) * tile_size[0]
         self.__height = len(board) * tile_size[1]
 
-        self.__is_moving = False
-        self.__moving_direction = [None, None]
-        self.__moving_block_idx = None
-        self.__speed = moving_speed * tile_size[0] / 32
+        # moving_speed: moves a block animates per second, playback_rate: moves of the answer played per second
+        self.__scheduler = modules.scheduler.Scheduler(moving_speed)
+        self.__playback_rate = playback_rate
+        self.__is_playing = False
+        self.__playback_time = 0
 
+        # the answer of the initial board, a reset brings it back whatever was solved since
+        self.__init_answer = (steps, process)
         self.__process, self.__step = process, steps
-        
-        logging.debug(f'steps: {steps}')
-        logging.debug(f'process: {process}')
+        # a partial answer only leads towards the goal, once it is played n searches again from there
+        self.__is_partial = False
+
+        # per-move messages are formatted only when they are shown, the level is checked once here
+        self.__is_debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        if self.__is_debug:
+            logging.debug(f'steps: {steps}')
+            logging.debug(f'process: {process}')
 
         for i in range(self.__block_num):
             self.__blocks[i].color = block_colors[i]
             self.__blocks[i].shape = block_types[i]
 
+        # idastar searches every depth again up to the answer, which takes minutes on a long one, so it needs a way out
+        if solving_method == 'idastar' and time_limit is None:
+            raise ValueError('the "idastar" method needs a time limit.')
+
+        # the solver and its worker process are set up by their getters, with fast_start only when n is first pressed
+        if solving_method not in ('astar', 'idastar'):
+            pattern_types = None
+        self.__solver_args = (block_types, goal, solution_cache_size, solution_cache_filepath, distance_table_filepath)
+        self.__worker_args = (block_types, goal, solving_method, pattern_types, pattern_filepath, parallel_worker_num, memory_limit, time_limit)
+        self.__solver = None
+        self.__worker = None
+        self.__solving_board = None
+        if not fast_start:
+            self.__get_solver()
+            self.__get_worker()
+
         self.reset(surface)
 
     def play_answer(self):
         if self.__curr_answer_step == -1:
-            prev_board = copy.deepcopy(self.__board)
-            self.__step, self.__process = self.__solve()
-            self.__board = copy.deepcopy(prev_board)
-            self.__curr_answer_step = 0
-            return
-        if self.__step is None or self.__process is None:
+            if self.__worker is not None and self.__worker.is_busy():
+                return
+            # with a playback rate the answer starts playing as soon as it is known
+            self.__set_playing(self.__playback_rate is not None)
+            answer = self.__get_solver().get_known_answer(self.__board)
+            if answer is not None:
+                self.__step, self.__process = answer
+                self.__is_partial = False
+                self.__curr_answer_step = 0
+                return
+            self.__solving_board = copy.deepcopy(self.__board)
+            self.__get_worker().submit(self.__solving_board)
             return
-        if self.__curr_answer_step >= self.__step:
+        if self.__playback_rate is not None:
+            self.__set_playing(not self.__is_playing)
             return
-
-        step = self.__curr_answer_step * 2
-        block_idx = int(self.__process[step])
-        key = self.CHAR2ENUM[self.__process[step + 1]]
-
-        self.__swap(block_idx, key)
-        self.__curr_answer_step += 1
-
-    def __solve(self):
-        import collections
-
-        que = collections.deque()
-        que.append((copy.deepcopy(self.__board), 0, ''))
-        is_saw = set()
-        is_saw.add(''.join([''.join(['x' if i == -1 else str(self.__blocks[i].shape) for i in row]) for row in self.__board]))
-        logging.debug(f'{"".join(["".join(["x" if i == -1 else str(self.__blocks[i].shape) for i in row]) for row in self.__board])}')
-
-        while len(que) > 0:
-            board, step, process = que.popleft()
-            logging.debug('board')
-            [logging.debug(row) for row in board]
-            logging.debug(f'step: {step}')
-            logging.debug(f'process: {process}')
-
-            spaces = []
-            for i in range(len(board)):
-                for j in range(len(board[i])):
-                    if board[i][j] == -1:
-                        spaces.append((i, j))
-
-            search_block_idxs = []
-            for space in spaces:
-                for value in self.ENUM2DIR.values():
-                    if space[0] + value[0] < 0 or space[0] + value[0] >= len(board):
-                        continue
-                    if space[1] + value[1] < 0 or space[1] + value[1] >= len(board[0]):
-                        continue
-                    if board[space[0] + value[0]][space[1] + value[1]] == -1:
-                        continue
-                    if board[space[0] + value[0]][space[1] + value[1]] in search_block_idxs:
-                        continue
-                    search_block_idxs.append(board[space[0] + value[0]][space[1] + value[1]])
-
-            for block_idx in search_block_idxs:
-                for dir, is_movable in self.__is_movable(block_idx, board).items():
-                    if not is_movable:
-                        continue
-                    next_board = copy.deepcopy(board)
-                    block_coords = list()
-                    for i in range(len(next_board)):
-                        for j in range(len(next_board[i])):
-                            if next_board[i][j] == block_idx:
-                                block_coords.append((i, j))
-                    for coord in block_coords:
-                        next_board[coord[0]][coord[1]] = -1
-                    for coord in block_coords:
-                        next_board[coord[0] + self.ENUM2DIR[dir][0]][coord[1] + self.ENUM2DIR[dir][1]] = block_idx
-
-                    next_board_str = ''.join([''.join(['x' if i == -1 else str(self.__blocks[i].shape) for i in row]) for row in next_board])
-                    if next_board_str in is_saw:
-                        continue
-                    is_saw.add(next_board_str)
-                    que.append((next_board, step + 1, process + f'{block_idx}{self.ENUM2CHAR[dir]}'))
-
-                    is_goal = True
-                    for goal_coord in self.__goal_coords:
-                        if next_board[goal_coord[0]][goal_coord[1]] != self.__goal_block:
-                            is_goal = False
-                    if is_goal:
-                        return (step + 1, process + f'{block_idx}{self.ENUM2CHAR[dir]}')
-
-            logging.debug(f'queue size: {len(que)}')
-
-        return (None, None)
+        self.__play_step()
 
     def reset(self, surface: pygame.Surface, dirty_rects: list = []):
         logging.debug('board is reset.')
+        if self.__worker is not None:
+            self.__worker.cancel()
+        self.__scheduler.clear()
+        self.__set_playing(False)
+        self.__step, self.__process = self.__init_answer
+        self.__is_partial = False
         self.__curr_answer_step = 0
         board_rect = pygame.Rect(self.__top_left[1], self.__top_left[0], self.__width, self.__height)
         dirty_rects.append(board_rect)
@@ -166,23 +139,24 @@ class Board:
 
                 self.__blocks[block_idx].coords.append((i, j))
 
-                is_connected = self.__is_connected((i, j))
-                rect = self.__get_rect((i, j), is_connected)
-
-                if not is_connected[pygame.K_UP] and not is_connected[pygame.K_LEFT]:
-                    self.__blocks[block_idx].curr_top_left = [rect.top, rect.left]
-                if not is_connected[pygame.K_DOWN] and not is_connected[pygame.K_RIGHT]:
-                    self.__blocks[block_idx].curr_bottom_right = [rect.top + rect.height, rect.left + rect.width]
-
-                pygame.draw.rect(
-                    surface, self.__blocks[block_idx].color, rect,
-                    border_top_left_radius=0 if is_connected[pygame.K_UP] or is_connected[pygame.K_LEFT] else self.__radius,
-                    border_top_right_radius=0 if is_connected[pygame.K_UP] or is_connected[pygame.K_RIGHT] else self.__radius,
-                    border_bottom_left_radius=0 if is_connected[pygame.K_DOWN] or is_connected[pygame.K_LEFT] else self.__radius,
-                    border_bottom_right_radius=0 if is_connected[pygame.K_DOWN] or is_connected[pygame.K_RIGHT] else self.__radius,
-                )
+        self.__legal_moves = modules.move_table.LegalMoves(self.__move_table, self.__init_board)
+        for block_idx, block in enumerate(self.__blocks):
+            block.mask = self.__legal_moves.get_mask(block_idx)
+            block.curr_top_left, block.curr_bottom_right = self.__get_corners(block.coords)
+            rect = self.__get_rect(block)
+            surface.blit(self.__get_sprite(block, rect.size, block.color, self.__radius), rect)
+
+    def update(self, surface: pygame.Surface, dirty_rects: list, cursor: list, event_type: int, key: int, elapsed: float = 0):
+        if self.__worker is not None and self.__worker.is_done():
+            result = self.__worker.get_result()
+            if result is not None:
+                self.__step, self.__process, states, self.__is_partial = result
+                if not self.__is_partial:
+                    self.__solver.remember_answer(self.__solving_board, (self.__step, self.__process))
+                if self.__is_debug:
+                    logging.debug(f'states: {states}')
+                self.__curr_answer_step = 0
 
-    def update(self, surface: pygame.Surface, dirty_rects: list, cursor: list, event_type: int, key: int):
         block_idx = self.__get_block_idx(cursor)
 
         is_movable = {pygame.K_UP: False, pygame.K_DOWN: False, pygame.K_RIGHT: False, pygame.K_LEFT: False}
@@ -191,143 +165,178 @@ class Board:
         if event_type == pygame.MOUSEBUTTONUP and list(is_movable.values()).count(True) == 1:
             key = [key for key, value in is_movable.items() if value][0]
 
-        if any(is_movable.values()) and key is not None and is_movable[key] and not self.__is_moving:
+        if any(is_movable.values()) and key is not None and is_movable[key]:
             self.__swap(block_idx, key)
+            if self.__worker is not None:
+                self.__worker.cancel()
+            self.__set_playing(False)
             self.__curr_answer_step = -1
 
-        if self.__is_moving:
-            self.__draw_moving_block(surface, dirty_rects)
+        if self.__is_playing and self.__curr_answer_step != -1:
+            # the answer keeps its rate however long the frames take, a slow frame plays several moves
+            self.__playback_time += elapsed
+            interval = 1000 / self.__playback_rate
+            while self.__is_playing and self.__playback_time >= interval:
+                self.__playback_time -= interval
+                self.__is_playing = self.__play_step()
 
-    def __draw_moving_block(self, surface: pygame.Surface, dirty_rects: list):
-        # draw background
-        block = self.__blocks[self.__moving_block_idx]
-        rect = pygame.Rect(
-            block.curr_top_left[1],
-            block.curr_top_left[0],
-            block.curr_bottom_right[1] - block.curr_top_left[1],
-            block.curr_bottom_right[0] - block.curr_top_left[0],
-        )
-        dirty_rects.append(rect)
-        pygame.draw.rect(surface, self.__bg_color, rect)
-
-        # update coord
-        block.curr_top_left[0] += self.__moving_direction[0] * self.__speed
-        block.curr_top_left[1] += self.__moving_direction[1] * self.__speed
-        block.curr_bottom_right[0] += self.__moving_direction[0] * self.__speed
-        block.curr_bottom_right[1] += self.__moving_direction[1] * self.__speed
-        diff = [
-            (block.next_top_left[0] - block.curr_top_left[0]) * self.__moving_direction[0],
-            (block.next_top_left[1] - block.curr_top_left[1]) * self.__moving_direction[1]
-        ]
-        if diff[0] < 0 or diff[1] < 0:
-            block.curr_top_left = block.next_top_left.copy()
-            block.curr_bottom_right = block.next_bottom_right.copy()
-            self.__is_moving = False
-            logging.debug(f'block {self.__moving_block_idx} is stopped.')
-
-        # draw block
-        rect = pygame.Rect(
+        if self.__scheduler.is_busy():
+            self.__draw_moving_blocks(surface, dirty_rects, elapsed)
+
+    def get_progress(self):
+        if self.__worker is None or not self.__worker.is_busy():
+            return None
+        return self.__worker.get_progress()
+
+    def wait(self):
+        if self.__worker is not None:
+            self.__worker.wait()
+
+    def close(self):
+        if self.__worker is not None:
+            self.__worker.close()
+
+    def __get_solver(self):
+        # imported here so that a fast start never loads the search modules before they are needed
+        if self.__solver is not None:
+            return self.__solver
+        import modules.solver
+        block_types, goal, solution_cache_size, solution_cache_filepath, distance_table_filepath = self.__solver_args
+        self.__solver = modules.solver.Solver(self.__init_board, block_types, goal)
+        if solution_cache_size is not None:
+            import modules.solution_cache
+            solution_cache = modules.solution_cache.SolutionCache(solution_cache_filepath, self.__solver.get_signature(), solution_cache_size)
+            self.__solver.set_solution_cache(solution_cache)
+        if distance_table_filepath is not None and os.path.exists(distance_table_filepath):
+            import modules.distance_table
+            distance_table = modules.distance_table.DistanceTable(distance_table_filepath)
+            if distance_table.get_signature() == self.__solver.get_signature():
+                self.__solver.set_distance_table(distance_table)
+            else:
+                logging.debug(f'distance table {distance_table_filepath} is made for another layout.')
+        return self.__solver
+
+    def __get_worker(self):
+        if self.__worker is None:
+            import modules.solving_worker
+            self.__worker = modules.solving_worker.SolvingWorker(self.__init_board, *self.__worker_args)
+        return self.__worker
+
+    def __play_step(self) -> bool:
+        if self.__step is None or self.__process is None:
+            return False
+        if self.__curr_answer_step >= self.__step:
+            if self.__is_partial:
+                self.__curr_answer_step = -1
+            return False
+
+        step = self.__curr_answer_step * 2
+        block_idx = int(self.__process[step])
+        key = self.CHAR2ENUM[self.__process[step + 1]]
+        if not self.__legal_moves.is_legal(block_idx, self.__key2dir[key]):
+            # an answer of another board, n searches again from here
+            logging.warning(f'block {block_idx} cannot be moved to {self.ENUM2CHAR[key]}, the answer is dropped.')
+            self.__curr_answer_step = -1
+            return False
+
+        self.__swap(block_idx, key)
+        self.__curr_answer_step += 1
+        return True
+
+    def __set_playing(self, is_playing: bool):
+        self.__is_playing = is_playing
+        # the first move is played at once
+        self.__playback_time = 1000 / self.__playback_rate if self.__playback_rate is not None else 0
+
+    def __draw_moving_blocks(self, surface: pygame.Surface, dirty_rects: list, elapsed: float):
+        positions = self.__scheduler.advance(elapsed)
+
+        # clear every old position first, so that a clearing never paints over a block drawn in this frame
+        old_rects = list()
+        for block_idx, _, _ in positions:
+            rect = self.__get_rect(self.__blocks[block_idx])
+            old_rects.append(rect)
+            surface.blit(self.__get_sprite(self.__blocks[block_idx], rect.size, self.__bg_color), rect)
+
+        for (block_idx, top_left, is_done), old_rect in zip(positions, old_rects):
+            block = self.__blocks[block_idx]
+            # the size comes from the cells, only the top left is interpolated so that no rounding error adds up
+            top_left_corner, bottom_right_corner = self.__get_corners(block.coords)
+            size = [bottom_right_corner[0] - top_left_corner[0], bottom_right_corner[1] - top_left_corner[1]]
+            block.curr_top_left = top_left
+            block.curr_bottom_right = [top_left[0] + size[0], top_left[1] + size[1]]
+            rect = self.__get_rect(block)
+            surface.blit(self.__get_sprite(block, rect.size, block.color, self.__radius), rect)
+            # a block only moves by one cell, so its old and new rect merge into one dirty rect
+            dirty_rects.append(old_rect.union(rect))
+            if is_done and self.__is_debug:
+                logging.debug(f'block {block_idx} is stopped.')
+
+    def __get_rect(self, block: modules.block.Block) -> pygame.Rect:
+        return pygame.Rect(
             block.curr_top_left[1],
             block.curr_top_left[0],
             block.curr_bottom_right[1] - block.curr_top_left[1],
             block.curr_bottom_right[0] - block.curr_top_left[0],
         )
-        dirty_rects.append(rect)
-        pygame.draw.rect(surface, block.color, rect, border_radius=self.__radius)
 
-    def __get_rect(self, coord: tuple, is_connected: dict) -> pygame.Rect:
-        i, j = coord
-        top = self.__top_left[1] + i * self.__tile_size[1] + (0 if is_connected[pygame.K_UP] else self.__gap)
-        left = self.__top_left[0] + j * self.__tile_size[0] + (0 if is_connected[pygame.K_LEFT] else self.__gap)
-        width = self.__tile_size[0] - (0 if is_connected[pygame.K_LEFT] else self.__gap) - (0 if is_connected[pygame.K_RIGHT] else self.__gap)
-        height = self.__tile_size[1] - (0 if is_connected[pygame.K_UP] else self.__gap) - (0 if is_connected[pygame.K_DOWN] else self.__gap)
-        return pygame.Rect(left, top, width, height)
+    def __get_sprite(self, block: modules.block.Block, size: tuple, color: tuple, radius: int = 0) -> pygame.Surface:
+        # a block that is not a rectangle is drawn cell by cell, clearing it also leaves the other blocks in its bounding box alone
+        top, left = min([i for i, _ in block.coords]), min([j for _, j in block.coords])
+        bottom, right = max([i for i, _ in block.coords]), max([j for _, j in block.coords])
+        if len(block.coords) == (bottom - top + 1) * (right - left + 1):
+            return self.__sprites.get(size, color, radius)
+        cells = tuple(sorted([(i - top, j - left) for i, j in block.coords]))
+        return self.__sprites.get(size, color, radius, cells, self.__tile_size, self.__gap)
 
     def __swap(self, block_idx: int, key: int):
-        logging.debug(f'block {block_idx} is swaiped to {self.ENUM2CHAR[key]}.')
         block = self.__blocks[block_idx]
 
-        if logging.root.level == logging.DEBUG:
+        if self.__is_debug:
+            logging.debug(f'block {block_idx} is swaiped to {self.ENUM2CHAR[key]}.')
             [logging.debug(f'block {block_idx} [{coord}] is swapped to {self.ENUM2CHAR[key]}.') for coord in block.coords]
 
+        start = self.__get_corners(block.coords)[0]
         for coord in block.coords:
             self.__board[coord[0]][coord[1]] = -1
-        for coord in block.coords:
-            self.__board[coord[0] + self.ENUM2DIR[key][0]][coord[1] + self.ENUM2DIR[key][1]] = block_idx
         block.coords = [(coord[0] + self.ENUM2DIR[key][0], coord[1] + self.ENUM2DIR[key][1]) for coord in block.coords]
-
         for coord in block.coords:
-            is_connected = self.__is_connected(coord)
-            rect = self.__get_rect(coord, is_connected)
-            if not is_connected[pygame.K_UP] and not is_connected[pygame.K_LEFT]:
-                self.__blocks[block_idx].next_top_left = [rect.top, rect.left]
-            if not is_connected[pygame.K_DOWN] and not is_connected[pygame.K_RIGHT]:
-                self.__blocks[block_idx].next_bottom_right = [rect.top + rect.height, rect.left + rect.width]
-            logging.debug(f'block {block_idx} [{coord}] will be moved to {self.__blocks[block_idx].next_top_left}.')
-
-        self.__is_moving = True
-        self.__moving_block_idx = block_idx
-        self.__moving_direction = self.ENUM2DIR[key]
+            self.__board[coord[0]][coord[1]] = block_idx
+
+        self.__legal_moves.apply(block_idx, self.__key2dir[key])
+        next_mask = self.__legal_moves.get_mask(block_idx)
+        end = self.__get_corners(block.coords)[0]
+        # the board changes at once, the scheduler only animates the block towards it
+        self.__scheduler.push(block_idx, start, end, block.mask | next_mask)
+        block.mask = next_mask
+        if self.__is_debug:
+            logging.debug(f'block {block_idx} will be moved to {end}.')
 
     def __get_block_idx(self, cursor: list) -> int:
+        # the board itself is the spatial index, the cursor only has to be mapped to a cell
         if cursor is None:
             return None
-        for i in range(self.__block_num):
-            if cursor[0] < self.__blocks[i].curr_top_left[0] or cursor[0] > self.__blocks[i].curr_bottom_right[0]:
-                continue
-            if cursor[1] < self.__blocks[i].curr_top_left[1] or cursor[1] > self.__blocks[i].curr_bottom_right[1]:
-                continue
-            return i
-
-    def __is_connected(self, coord: tuple, board: list = None) -> dict:
-        if board is None:
-            board = self.__board
-        is_connected = dict()
-        for key, value in self.ENUM2DIR.items():
-            i, j = coord
-            is_connected[key] = False
-            if board[i][j] == -1:
-                continue
-            next_i = i + value[0]
-            next_j = j + value[1]
-            if next_j < 0 or next_j >= len(board[i]) or next_i < 0 or next_i >= len(board):
-                continue
-            if board[i][j] != board[next_i][next_j]:
-                continue
-            is_connected[key] = True
-        return is_connected
-
-    def __is_movable(self, block_idx, board: list = None):
-        if board is None:
-            board = self.__board
-        is_movable = {pygame.K_UP: True, pygame.K_DOWN: True, pygame.K_RIGHT: True, pygame.K_LEFT: True}
-        block_coords = list()
-        for i in range(len(board)):
-            for j in range(len(board[i])):
-                if board[i][j] == block_idx:
-                    block_coords.append((i, j))
-        is_connected = {coord: self.__is_connected(coord, board) for coord in block_coords}
-
-        for coord, is_connected in is_connected.items():
-            for key, value in is_movable.items():
-
-                if is_connected[key]:
-                    continue
+        i = (cursor[0] - self.__top_left[1]) // self.__tile_size[1]
+        j = (cursor[1] - self.__top_left[0]) // self.__tile_size[0]
+        if i < 0 or i >= len(self.__board) or j < 0 or j >= self.__col_num:
+            return None
+        block_idx = self.__board[i][j]
+        return None if block_idx == -1 else block_idx
 
-                first = coord[0] + self.ENUM2DIR[key][0]
-                second = coord[1] + self.ENUM2DIR[key][1]
-                if first < 0 or first >= len(board):
-                    is_movable[key] = False
-                    continue
-                if second < 0 or second >= len(board[0]):
-                    is_movable[key] = False
-                    continue
+    def __get_corners(self, coords: list) -> tuple:
+        # corners of the bounding box of the cells, inside the gap
+        top = self.__top_left[1] + min([i for i, _ in coords]) * self.__tile_size[1] + self.__gap
+        left = self.__top_left[0] + min([j for _, j in coords]) * self.__tile_size[0] + self.__gap
+        bottom = self.__top_left[1] + (max([i for i, _ in coords]) + 1) * self.__tile_size[1] - self.__gap
+        right = self.__top_left[0] + (max([j for _, j in coords]) + 1) * self.__tile_size[0] - self.__gap
+        return ([top, left], [bottom, right])
 
-                is_movable[key] = value and board[first][second] == -1
+    def __is_movable(self, block_idx):
+        is_movable = {key: self.__legal_moves.is_legal(block_idx, d) for key, d in self.__key2dir.items()}
 
-        if logging.root.level == logging.DEBUG:
+        if self.__is_debug:
             [logging.debug(f'block {block_idx} is movable to {self.ENUM2DIR[key]}.') for key, value in is_movable.items() if value]
-        if not any(is_movable.values()):
-            logging.debug(f'block {block_idx} is not movable.')
+            if not any(is_movable.values()):
+                logging.debug(f'block {block_idx} is not movable.')
 
         return is_movable
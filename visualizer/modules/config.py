@@ -0,0 +1,38 @@
+import marshal
+import os
+
+import modules.atomic_file
+
+
+def load(filepath: str) -> dict:
+    # a parsed config is kept in a marshal file next to it keyed by the mtime and size of the file,
+    # so an unchanged config neither imports json nor strips comments again
+    stat = os.stat(filepath)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cache_filepath = filepath + '.cache'
+    try:
+        with open(cache_filepath, 'rb') as f:
+            cached_signature, config = marshal.load(f)
+        if tuple(cached_signature) == signature:
+            return config
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    config = _parse(filepath)
+    try:
+        # a read-only install simply parses the file every time
+        with modules.atomic_file.open_atomic(cache_filepath) as f:
+            marshal.dump((signature, config), f)
+    except OSError:
+        pass
+    return config
+
+
+def _parse(filepath: str) -> dict:
+    import json
+    import re
+
+    # the config files allow c style comments
+    with open(filepath, 'r') as f:
+        text = f.read()
+    return json.loads(re.sub(r'/\*[\s\S]*?\*/|//.*', '', text))
@@ -0,0 +1,66 @@
+import mmap
+import struct
+
+import modules.atomic_file
+
+
+class DistanceTable:
+
+    MAGIC = b'SPDT'
+    VERSION = 1
+    # magic, version, key size, distance size, state count, signature length
+    HEADER = struct.Struct('<4sHHHQI')
+
+    def __init__(self, filepath: str):
+        with open(filepath, 'rb') as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.__key_size, self.__distance_size, self.__count, signature_length = self.HEADER.unpack_from(self.__mmap, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f'{filepath} is not a distance table of version {self.VERSION}.')
+        offset = self.HEADER.size
+        self.__signature = self.__mmap[offset:offset + signature_length].decode('utf-8')
+        offset += signature_length
+
+        self.__keys_offset = offset
+        self.__distances_offset = offset + self.__key_size * self.__count
+
+    def lookup(self, key: int):
+        if key.bit_length() > self.__key_size * 8:
+            return None
+        # the keys are sorted big-endian, so byte order equals numeric order and a state's rank is its index
+        target = key.to_bytes(self.__key_size, 'big')
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = self.__keys_offset + mid * self.__key_size
+            if self.__mmap[offset:offset + self.__key_size] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        offset = self.__keys_offset + lo * self.__key_size
+        if lo == self.__count or self.__mmap[offset:offset + self.__key_size] != target:
+            return None
+        offset = self.__distances_offset + lo * self.__distance_size
+        return int.from_bytes(self.__mmap[offset:offset + self.__distance_size], 'little')
+
+    def get_signature(self) -> str:
+        return self.__signature
+
+    def __len__(self) -> int:
+        return self.__count
+
+    @classmethod
+    def build(cls, solver, filepath: str) -> int:
+        distances = solver.get_distances(solver.get_goal_states())
+        keys = sorted(distances.keys())
+        key_size = (max([key.bit_length() for key in keys], default=0) + 7) // 8
+        distance_size = 1 if max(distances.values(), default=0) < 1 << 8 else 2
+        signature = solver.get_signature().encode('utf-8')
+
+        with modules.atomic_file.open_atomic(filepath) as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, key_size, distance_size, len(keys), len(signature)))
+            f.write(signature)
+            f.write(b''.join([key.to_bytes(key_size, 'big') for key in keys]))
+            f.write(b''.join([distances[key].to_bytes(distance_size, 'little') for key in keys]))
+        return len(keys)
@@ -0,0 +1,173 @@
+import heapq
+import logging
+import os
+import tempfile
+
+import modules.solver
+
+
+class _SortedKeys:
+
+    def __init__(self, records, key_size: int):
+        self.__records = records
+        self.__key_size = key_size
+        self.__head = next(self.__records, None)
+
+    def contains(self, key: bytes) -> bool:
+        # queries come in ascending order, so the stream only moves forward
+        while self.__head is not None and self.__head[:self.__key_size] < key:
+            self.__head = next(self.__records, None)
+        return self.__head is not None and self.__head[:self.__key_size] == key
+
+
+class ExternalSolver:
+
+    # records read or written per file access
+    CHUNK_RECORDS = 4096
+    # approximate bytes python spends on a bytes object and its list slot besides the record itself
+    RECORD_OVERHEAD = 41
+
+    def __init__(self, board: list, block_types: list, goal: dict, memory_limit: int = 64 * 1024 * 1024, directory: str = None):
+        self.__solver = modules.solver.Solver(board, block_types, goal)
+        groups = self.__solver.get_groups()
+        cell_num = self.__solver.get_cell_num()
+
+        # record: key (big-endian, so records sort by key) | anchors | occupancy | parent index | move code
+        self.__key_size = ((max(groups) + 1) * cell_num + 7) // 8
+        self.__anchor_size = (len(groups) * cell_num.bit_length() + 7) // 8
+        self.__occupancy_size = (cell_num + 7) // 8
+        code_num = len(groups) * len(self.__solver.DIR_CHARS)
+        self.__code_size = ((code_num - 1).bit_length() + 7) // 8
+        self.__record_size = self.__key_size + self.__anchor_size + self.__occupancy_size + 4 + self.__code_size
+        self.__buffer_limit = max(1, memory_limit // (self.__record_size + self.RECORD_OVERHEAD))
+
+        self.__directory = directory
+        self.__states = 0
+        self.__expanded = 0
+        self.__peak_frontier = 0
+        self.__monitor = None
+
+    def solve(self, board: list) -> tuple:
+        anchors, occupancy, key = self.__solver.encode(board)
+        if self.__solver.is_goal(anchors):
+            self.__states, self.__expanded, self.__peak_frontier = 1, 0, 0
+            return (0, '')
+
+        with tempfile.TemporaryDirectory(prefix='sliding-puzzle-', dir=self.__directory) as directory:
+            layer_filepaths = [os.path.join(directory, 'layer0')]
+            with open(layer_filepaths[0], 'wb') as f:
+                f.write(self.__pack(key, anchors, occupancy, 0, 0))
+            self.__states, self.__expanded, self.__peak_frontier = 1, 0, 1
+
+            while True:
+                depth = len(layer_filepaths) - 1
+                run_filepaths, buffer = self.__expand(layer_filepaths[depth], directory)
+
+                # every move can be undone, so a new state can only collide with the current and the previous layer
+                layer_filepaths.append(os.path.join(directory, f'layer{depth + 1}'))
+                old_keys = [_SortedKeys(self.__read(filepath), self.__key_size) for filepath in layer_filepaths[max(0, depth - 1):depth + 1]]
+                count, goal_idx = self.__merge(run_filepaths, buffer, old_keys, layer_filepaths[-1])
+                for filepath in run_filepaths:
+                    os.remove(filepath)
+
+                self.__states += count
+                self.__peak_frontier = max(self.__peak_frontier, count)
+                logging.debug(f'depth: {depth + 1}, states: {self.__states}, frontier: {count}')
+                if goal_idx is not None:
+                    return self.__get_answer(layer_filepaths, goal_idx)
+                if count == 0:
+                    logging.debug(f'no answer found in {self.__states} states.')
+                    return (None, None)
+
+    def get_states(self) -> int:
+        return self.__states
+
+    def get_stats(self) -> dict:
+        return {'states': self.__states, 'expanded': self.__expanded, 'peak_frontier': self.__peak_frontier}
+
+    def set_monitor(self, monitor):
+        self.__monitor = monitor
+
+    def __expand(self, layer_filepath: str, directory: str) -> tuple:
+        run_filepaths, buffer = list(), list()
+        for idx, record in enumerate(self.__read(layer_filepath)):
+            key, anchors, occupancy, _, _ = self.__unpack(record)
+            self.__expanded += 1
+            for code, next_anchors, next_occupancy, next_key in self.__solver.get_successors(anchors, occupancy, key):
+                buffer.append(self.__pack(next_key, next_anchors, next_occupancy, idx, code))
+
+            if len(buffer) >= self.__buffer_limit:
+                run_filepaths.append(os.path.join(directory, f'run{len(run_filepaths)}'))
+                self.__write(run_filepaths[-1], sorted(buffer))
+                buffer = list()
+            if self.__monitor is not None and (idx + 1) % modules.solver.Solver.REPORT_INTERVAL == 0:
+                self.__monitor(self.__states, len(buffer))
+
+        buffer.sort()
+        return (run_filepaths, buffer)
+
+    def __merge(self, run_filepaths: list, buffer: list, old_keys: list, layer_filepath: str) -> tuple:
+        count, goal_idx = 0, None
+        last_key = None
+        with open(layer_filepath, 'wb') as f:
+            chunk = list()
+            for record in heapq.merge(*[self.__read(filepath) for filepath in run_filepaths], buffer):
+                key = record[:self.__key_size]
+                if key == last_key:
+                    continue
+                last_key = key
+                if any([keys.contains(key) for keys in old_keys]):
+                    continue
+
+                chunk.append(record)
+                if self.__solver.is_goal(self.__unpack(record)[1]):
+                    goal_idx = count
+                    break
+                count += 1
+                if len(chunk) == self.CHUNK_RECORDS:
+                    f.write(b''.join(chunk))
+                    chunk = list()
+            f.write(b''.join(chunk))
+        return (count if goal_idx is None else count + 1, goal_idx)
+
+    def __get_answer(self, layer_filepaths: list, idx: int) -> tuple:
+        codes = list()
+        for layer_filepath in reversed(layer_filepaths[1:]):
+            with open(layer_filepath, 'rb') as f:
+                f.seek(idx * self.__record_size)
+                _, _, _, idx, code = self.__unpack(f.read(self.__record_size))
+            codes.append(code)
+        codes.reverse()
+        logging.debug(f'answer found in {self.__states} states.')
+        return (len(codes), self.__solver.get_process(codes))
+
+    def __pack(self, key: int, anchors: int, occupancy: int, parent_idx: int, code: int) -> bytes:
+        return b''.join([
+            key.to_bytes(self.__key_size, 'big'),
+            anchors.to_bytes(self.__anchor_size, 'little'),
+            occupancy.to_bytes(self.__occupancy_size, 'little'),
+            parent_idx.to_bytes(4, 'little'),
+            code.to_bytes(self.__code_size, 'little'),
+        ])
+
+    def __unpack(self, record: bytes) -> tuple:
+        offset = self.__key_size
+        key = int.from_bytes(record[:offset], 'big')
+        anchors = int.from_bytes(record[offset:offset + self.__anchor_size], 'little')
+        offset += self.__anchor_size
+        occupancy = int.from_bytes(record[offset:offset + self.__occupancy_size], 'little')
+        offset += self.__occupancy_size
+        return (key, anchors, occupancy, int.from_bytes(record[offset:offset + 4], 'little'), int.from_bytes(record[offset + 4:], 'little'))
+
+    def __read(self, filepath: str):
+        with open(filepath, 'rb') as f:
+            while True:
+                data = f.read(self.__record_size * self.CHUNK_RECORDS)
+                if len(data) == 0:
+                    return
+                for offset in range(0, len(data), self.__record_size):
+                    yield data[offset:offset + self.__record_size]
+
+    def __write(self, filepath: str, records: list):
+        with open(filepath, 'wb') as f:
+            f.write(b''.join(records))
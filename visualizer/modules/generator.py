@@ -0,0 +1,73 @@
+import collections
+import logging
+import random
+
+import modules.solver
+
+
+class Generator:
+
+    def __init__(self, board: list, block_types: list, goal: dict, seed: int = None):
+        self.__solver = modules.solver.Solver(board, block_types, goal)
+        self.__random = random.Random(seed)
+
+        # one reverse bfs from every goal state, layers[d]: states whose answer is d moves long
+        self.__distances = dict()
+        self.__layers = list()
+        que = collections.deque()
+        for state in self.__solver.get_goal_states():
+            if state[2] not in self.__distances:
+                self.__distances[state[2]] = 0
+                que.append(state)
+        while len(que) > 0:
+            state = que.popleft()
+            distance = self.__distances[state[2]]
+            if distance == len(self.__layers):
+                self.__layers.append(list())
+            self.__layers[distance].append(state)
+            for _, anchors, occupancy, key in self.__solver.get_successors(*state):
+                if key not in self.__distances:
+                    self.__distances[key] = distance + 1
+                    que.append((anchors, occupancy, key))
+        logging.debug(f'{len(self.__distances)} states are {len(self.__layers) - 1} moves away from the goal at most.')
+
+    def generate(self, distance: int = None, num: int = 1) -> list:
+        # {output, process, steps} of layouts sampled from one layer, or the farthest layouts when no distance is given
+        if distance is None:
+            states = list()
+            for layer in reversed(self.__layers):
+                states.extend(self.__random.sample(layer, min(num - len(states), len(layer))))
+                if len(states) == num:
+                    break
+            return [self.__get_puzzle(state) for state in states]
+
+        if distance < 0 or distance > self.get_max_distance():
+            raise ValueError(f'no layout is {distance} moves away from the goal, the farthest one is {self.get_max_distance()} moves away.')
+        layer = self.__layers[distance]
+        if num > len(layer):
+            logging.warning(f'only {len(layer)} layouts are {distance} moves away from the goal.')
+        return [self.__get_puzzle(state) for state in self.__random.sample(layer, min(num, len(layer)))]
+
+    def get_max_distance(self) -> int:
+        return len(self.__layers) - 1
+
+    def get_layer_sizes(self) -> list:
+        return [len(layer) for layer in self.__layers]
+
+    def __get_puzzle(self, state: tuple) -> dict:
+        # every state but a goal has a neighbour one move closer, following them gives an optimal answer
+        board = self.__solver.decode(state[0])
+        codes = list()
+        distance = self.__distances[state[2]]
+        while distance > 0:
+            for code, anchors, occupancy, key in self.__solver.get_successors(*state):
+                if self.__distances.get(key) == distance - 1:
+                    break
+            codes.append(code)
+            state = (anchors, occupancy, key)
+            distance -= 1
+        return {
+            'output': board,
+            'process': self.__solver.get_process(codes),
+            'steps': len(codes),
+        }
@@ -0,0 +1,159 @@
+class MoveTable:
+
+    # opposite directions are paired so that d ^ 1 reverses direction d
+    DIR2VEC = {
+        'U': (-1, 0),
+        'D': (1, 0),
+        'R': (0, 1),
+        'L': (0, -1),
+    }
+    DIR_CHARS = tuple(DIR2VEC.keys())
+
+    def __init__(self, board: list):
+        # cells are bits of i * width + j, a block is placed by its anchor, the first of its cells in row-major order
+        self.__height = len(board)
+        self.__width = len(board[0])
+        self.__cell_num = self.__height * self.__width
+        self.__block_num = max([max(idxs) for idxs in board]) + 1
+
+        # cell offsets of every block relative to its anchor
+        offsets = [list() for _ in range(self.__block_num)]
+        for i in range(self.__height):
+            for j in range(self.__width):
+                if board[i][j] != -1:
+                    offsets[board[i][j]].append((i, j))
+        for block_offsets in offsets:
+            anchor = block_offsets[0]
+            block_offsets[:] = [(i - anchor[0], j - anchor[1]) for i, j in block_offsets]
+
+        # blocks of the same shape share their tables
+        shapes = dict()
+        self.__shapes = [shapes.setdefault(tuple(block_offsets), len(shapes)) for block_offsets in offsets]
+        self.__shape_offsets = list(shapes.keys())
+
+        # masks[s][p]: cells of shape s anchored at p, None where it leaves the board
+        self.__masks = [[self.__get_mask(shape_offsets, p) for p in range(self.__cell_num)] for shape_offsets in self.__shape_offsets]
+        # steps[s][p]: (direction, next anchor, cells entered) of every move of shape s at p that stays on the board,
+        # the move is legal when the cells entered are empty
+        self.__steps = [[None] * self.__cell_num for _ in self.__shape_offsets]
+        for s, masks in enumerate(self.__masks):
+            for p, mask in enumerate(masks):
+                if mask is None:
+                    continue
+                steps = list()
+                for d, vec in enumerate(self.DIR2VEC.values()):
+                    next_p = self.__get_neighbour(p, vec)
+                    if next_p is not None and masks[next_p] is not None:
+                        steps.append((d, next_p, masks[next_p] & ~mask))
+                self.__steps[s][p] = tuple(steps)
+
+        # neighbours[p]: cells next to cell p
+        self.__neighbours = [
+            sum([1 << q for q in [self.__get_neighbour(p, vec) for vec in self.DIR2VEC.values()] if q is not None])
+            for p in range(self.__cell_num)
+        ]
+
+    def get_offsets(self, block_idx: int) -> list:
+        return list(self.__shape_offsets[self.__shapes[block_idx]])
+
+    def get_mask(self, block_idx: int, anchor: int):
+        return self.__masks[self.__shapes[block_idx]][anchor]
+
+    def get_steps(self, block_idx: int, anchor: int) -> tuple:
+        return self.__steps[self.__shapes[block_idx]][anchor]
+
+    def get_neighbours(self, mask: int) -> int:
+        neighbours = 0
+        for p in get_cells(mask):
+            neighbours |= self.__neighbours[p]
+        return neighbours & ~mask
+
+    def get_anchors(self, board: list) -> list:
+        anchors = [None] * self.__block_num
+        for i in range(self.__height):
+            for j in range(self.__width):
+                if board[i][j] != -1 and anchors[board[i][j]] is None:
+                    anchors[board[i][j]] = i * self.__width + j
+        return anchors
+
+    def get_block_num(self) -> int:
+        return self.__block_num
+
+    def get_cell_num(self) -> int:
+        return self.__cell_num
+
+    def __get_mask(self, offsets: tuple, anchor: int):
+        mask = 0
+        for offset in offsets:
+            p = self.__get_neighbour(anchor, offset)
+            if p is None:
+                return None
+            mask |= 1 << p
+        return mask
+
+    def __get_neighbour(self, p: int, offset: tuple):
+        i = p // self.__width + offset[0]
+        j = p % self.__width + offset[1]
+        if i < 0 or i >= self.__height or j < 0 or j >= self.__width:
+            return None
+        return i * self.__width + j
+
+
+class LegalMoves:
+
+    def __init__(self, move_table: MoveTable, board: list):
+        self.__table = move_table
+        self.__anchors = move_table.get_anchors(board)
+        self.__owners = [idx for row in board for idx in row]
+        self.__occupancy = 0
+        for b, anchor in enumerate(self.__anchors):
+            self.__occupancy |= move_table.get_mask(b, anchor)
+
+        # legal[b]: bits of the directions block b can move to now
+        self.__legal = [0] * move_table.get_block_num()
+        for b in range(move_table.get_block_num()):
+            self.__update(b)
+
+    def is_legal(self, block_idx: int, d: int) -> bool:
+        return self.__legal[block_idx] >> d & 1 == 1
+
+    def get_moves(self) -> list:
+        # (block index, direction) of every legal move
+        return [(b, d) for b, legal in enumerate(self.__legal) for d in range(len(MoveTable.DIR_CHARS)) if legal >> d & 1]
+
+    def get_mask(self, block_idx: int) -> int:
+        return self.__table.get_mask(block_idx, self.__anchors[block_idx])
+
+    def apply(self, block_idx: int, d: int):
+        if not self.is_legal(block_idx, d):
+            raise ValueError(f'block {block_idx} cannot be moved to {MoveTable.DIR_CHARS[d]}.')
+        mask = self.get_mask(block_idx)
+        next_p = [step[1] for step in self.__table.get_steps(block_idx, self.__anchors[block_idx]) if step[0] == d][0]
+        next_mask = self.__table.get_mask(block_idx, next_p)
+        for p in get_cells(mask & ~next_mask):
+            self.__owners[p] = -1
+        for p in get_cells(next_mask & ~mask):
+            self.__owners[p] = block_idx
+        self.__occupancy ^= mask ^ next_mask
+        self.__anchors[block_idx] = next_p
+
+        # only a block next to a vacated or filled cell can have gained or lost a move
+        blocks = {self.__owners[p] for p in get_cells(self.__table.get_neighbours(mask ^ next_mask))}
+        blocks.discard(-1)
+        blocks.add(block_idx)
+        for b in blocks:
+            self.__update(b)
+
+    def __update(self, block_idx: int):
+        legal = 0
+        for d, _, need in self.__table.get_steps(block_idx, self.__anchors[block_idx]):
+            if self.__occupancy & need == 0:
+                legal |= 1 << d
+        self.__legal[block_idx] = legal
+
+
+def get_cells(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
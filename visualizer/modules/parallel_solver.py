@@ -0,0 +1,152 @@
+import logging
+import multiprocessing
+import os
+
+import modules.solver
+
+
+def _run_worker(index: int, connection, inboxes: list, board: list, block_types: list, goal: dict, worker_num: int):
+    # a worker owns the keys whose hash falls on its index, together with their frontier states and parent pointers,
+    # successors go straight to the inbox of their owner so that no state passes through the parent
+    solver = modules.solver.Solver(board, block_types, goal)
+    # visited[key]: (parent key, code), None for the start
+    visited = dict()
+    frontier = list()
+
+    def merge(entries) -> list:
+        goals = list()
+        for anchors, occupancy, key, parent_key, code in entries:
+            if key in visited:
+                continue
+            visited[key] = None if parent_key is None else (parent_key, code)
+            frontier.append((anchors, occupancy, key))
+            if solver.is_goal(anchors):
+                goals.append(key)
+        return goals
+
+    while True:
+        try:
+            command, payload = connection.recv()
+        except EOFError:
+            # the process that owns the solver is gone without closing it
+            break
+        if command == 'expand':
+            buckets = [list() for _ in range(worker_num)]
+            for anchors, occupancy, key in frontier:
+                for code, next_anchors, next_occupancy, next_key in solver.get_successors(anchors, occupancy, key):
+                    buckets[hash(next_key) % worker_num].append((next_anchors, next_occupancy, next_key, key, code))
+            frontier = list()
+            for i, bucket in enumerate(buckets):
+                if i != index:
+                    inboxes[i].put(bucket)
+            # every other worker sends exactly one bucket per level, the parent starts the next level only once all have merged
+            goals = merge(buckets[index])
+            for _ in range(worker_num - 1):
+                goals.extend(merge(inboxes[index].get()))
+            connection.send((goals, len(frontier), len(visited)))
+        elif command == 'merge':
+            goals = merge(payload)
+            connection.send((goals, len(frontier), len(visited)))
+        elif command == 'trace':
+            connection.send(visited[payload])
+        elif command == 'reset':
+            visited, frontier = dict(), list()
+            connection.send(None)
+        elif command == 'close':
+            break
+
+
+class ParallelSolver:
+
+    def __init__(self, board: list, block_types: list, goal: dict, worker_num: int = None):
+        self.__solver = modules.solver.Solver(board, block_types, goal)
+        self.__worker_num = worker_num if worker_num is not None else os.cpu_count()
+        self.__states = 0
+        self.__expanded = 0
+        self.__peak_frontier = 0
+        self.__monitor = None
+
+        context = multiprocessing.get_context('spawn')
+        # the parent holds on to the inboxes, the workers can only rebuild queues that still exist
+        self.__inboxes = [context.Queue() for _ in range(self.__worker_num)]
+        self.__connections = list()
+        self.__processes = list()
+        for i in range(self.__worker_num):
+            connection, worker_connection = context.Pipe()
+            process = context.Process(target=_run_worker, args=(i, worker_connection, self.__inboxes, board, block_types, goal, self.__worker_num), daemon=True)
+            process.start()
+            self.__connections.append(connection)
+            self.__processes.append(process)
+        self.__is_closed = False
+
+    def solve(self, board: list) -> tuple:
+        anchors, occupancy, key = self.__solver.encode(board)
+        if self.__solver.is_goal(anchors):
+            self.__states, self.__expanded, self.__peak_frontier = 1, 0, 0
+            return (0, '')
+
+        self.__broadcast([('reset', None)] * self.__worker_num)
+        seeds = [list() for _ in range(self.__worker_num)]
+        seeds[hash(key) % self.__worker_num].append((anchors, occupancy, key, None, None))
+        self.__broadcast([('merge', seed) for seed in seeds])
+
+        # the parent only collects the counts and the goals of every level
+        frontier = 1
+        depth = 0
+        self.__expanded, self.__peak_frontier = 0, 1
+        while frontier > 0:
+            self.__expanded += frontier
+            results = self.__broadcast([('expand', None)] * self.__worker_num)
+
+            goals = [goal for result in results for goal in result[0]]
+            frontier = sum([result[1] for result in results])
+            self.__peak_frontier = max(self.__peak_frontier, frontier)
+            depth += 1
+            self.__states = sum([result[2] for result in results])
+            logging.debug(f'depth: {depth}, states: {self.__states}, frontier: {frontier}')
+            if self.__monitor is not None:
+                self.__monitor(self.__states, frontier)
+
+            if len(goals) > 0:
+                return self.__get_answer(goals[0])
+
+        logging.debug(f'no answer found in {self.__states} states.')
+        return (None, None)
+
+    def get_states(self) -> int:
+        return self.__states
+
+    def get_stats(self) -> dict:
+        return {'states': self.__states, 'expanded': self.__expanded, 'peak_frontier': self.__peak_frontier}
+
+    def set_monitor(self, monitor):
+        self.__monitor = monitor
+
+    def close(self):
+        if self.__is_closed:
+            return
+        self.__is_closed = True
+        for connection in self.__connections:
+            connection.send(('close', None))
+        for process in self.__processes:
+            process.join()
+
+    def __get_answer(self, key: int) -> tuple:
+        # the parent pointers stay with the owners of the keys, the path is traced one owner at a time
+        codes = list()
+        connection = self.__connections[hash(key) % self.__worker_num]
+        connection.send(('trace', key))
+        parent = connection.recv()
+        while parent is not None:
+            key, code = parent
+            codes.append(code)
+            connection = self.__connections[hash(key) % self.__worker_num]
+            connection.send(('trace', key))
+            parent = connection.recv()
+        codes.reverse()
+        return (len(codes), self.__solver.get_process(codes))
+
+    def __broadcast(self, messages: list) -> list:
+        for connection, message in zip(self.__connections, messages):
+            connection.send(message)
+        return [connection.recv() for connection in self.__connections]
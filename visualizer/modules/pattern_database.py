@@ -0,0 +1,64 @@
+import logging
+import math
+import os
+import pickle
+
+import modules.atomic_file
+import modules.solver
+
+
+class PatternDatabase:
+
+    VERSION = 1
+
+    def __init__(self, board: list, block_types: list, goal: dict, pattern_types: list, filepath: str = None):
+        goal_block = int(list(goal.keys())[0])
+        block_num = max([max(idxs) for idxs in board]) + 1
+
+        # the abstract board keeps the goal block and the blocks of the pattern types, the others become spaces
+        pattern_blocks = [b for b in range(block_num) if b == goal_block or block_types[b] in pattern_types]
+        abstract_idxs = {b: i for i, b in enumerate(pattern_blocks)}
+        abstract_board = [[abstract_idxs.get(b, -1) for b in row] for row in board]
+        abstract_types = [block_types[b] for b in pattern_blocks]
+        abstract_goal = {str(abstract_idxs[goal_block]): list(goal.values())[0]}
+        self.__solver = modules.solver.Solver(abstract_board, abstract_types, abstract_goal)
+
+        # every concrete group of a pattern block maps to exactly one abstract group
+        groups = modules.solver.Solver(board, block_types, goal).get_groups()
+        abstract_groups = self.__solver.get_groups()
+        self.__cell_num = self.__solver.get_cell_num()
+        self.__group_pairs = tuple(sorted(set([(groups[b], abstract_groups[abstract_idxs[b]]) for b in pattern_blocks])))
+
+        # abstract keys only depend on the board size and the block geometry, not on where the blocks start
+        signature = (self.VERSION, len(board), len(board[0]), self.__solver.get_shapes(), abstract_types, abstract_goal)
+        self.__distances = self.__load(filepath, signature)
+        if self.__distances is None:
+            self.__distances = self.__solver.get_distances(self.__solver.get_goal_states())
+            logging.debug(f'pattern database has {len(self.__distances)} entries.')
+            self.__save(filepath, signature)
+
+    def lookup(self, key: int) -> int:
+        segment_mask = (1 << self.__cell_num) - 1
+        abstract_key = 0
+        for group, abstract_group in self.__group_pairs:
+            abstract_key |= ((key >> (group * self.__cell_num)) & segment_mask) << (abstract_group * self.__cell_num)
+        return self.__distances.get(abstract_key, math.inf)
+
+    def __len__(self) -> int:
+        return len(self.__distances)
+
+    def __load(self, filepath: str, signature: tuple):
+        if filepath is None or not os.path.exists(filepath):
+            return None
+        with open(filepath, 'rb') as f:
+            data = pickle.load(f)
+        if data['signature'] != signature:
+            logging.debug(f'pattern database {filepath} is stale.')
+            return None
+        return data['distances']
+
+    def __save(self, filepath: str, signature: tuple):
+        if filepath is None:
+            return
+        with modules.atomic_file.open_atomic(filepath) as f:
+            pickle.dump({'signature': signature, 'distances': self.__distances}, f, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,103 @@
+import mmap
+import re
+import struct
+
+import modules.atomic_file
+
+
+class PuzzleFile:
+
+    MAGIC = b'SPZL'
+    VERSION = 1
+    DIR_CHARS = ('U', 'D', 'R', 'L')
+    # magic, version, height, width, move size, puzzle count, followed by the offset of every puzzle
+    HEADER = struct.Struct('<4sHBBBI')
+    OFFSET = struct.Struct('<Q')
+    # steps, states, followed by the board as signed bytes (-1 for spaces) and a code per move
+    RECORD = struct.Struct('<IQ')
+
+    def __init__(self, filepath: str):
+        with open(filepath, 'rb') as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__view = memoryview(self.__mmap)
+        self.__offsets = None
+
+        magic, version, self.__height, self.__width, self.__move_size, self.__count = self.HEADER.unpack_from(self.__view, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f'{filepath} is not a puzzle file of version {self.VERSION}.')
+        # native casts, the format is little-endian as every machine the visualizer runs on
+        self.__offsets = self.__view[self.HEADER.size:self.HEADER.size + self.OFFSET.size * self.__count].cast('Q')
+
+    def get(self, idx: int) -> dict:
+        # the keys of params.json
+        steps, states = self.RECORD.unpack_from(self.__view, self.__offsets[idx])
+        return {
+            'output': self.get_board(idx),
+            'process': self.get_process(idx),
+            'steps': steps,
+            'states': states,
+        }
+
+    def get_board(self, idx: int) -> list:
+        offset = self.__offsets[idx] + self.RECORD.size
+        return self.__view[offset:offset + self.__height * self.__width].cast('b', (self.__height, self.__width)).tolist()
+
+    def get_codes(self, idx: int) -> memoryview:
+        # block index * 4 + direction per move, a view into the file rather than a copy
+        steps, _ = self.RECORD.unpack_from(self.__view, self.__offsets[idx])
+        offset = self.__offsets[idx] + self.RECORD.size + self.__height * self.__width
+        return self.__view[offset:offset + steps * self.__move_size].cast('B' if self.__move_size == 1 else 'H')
+
+    def get_process(self, idx: int) -> str:
+        return ''.join([f'{code >> 2}{self.DIR_CHARS[code & 3]}' for code in self.get_codes(idx)])
+
+    def close(self):
+        if self.__view is None:
+            return
+        if self.__offsets is not None:
+            self.__offsets.release()
+        self.__view.release()
+        self.__mmap.close()
+        self.__view = None
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @classmethod
+    def write(cls, filepath: str, puzzles: list) -> int:
+        # puzzles: dicts with the keys of params.json, every board of the same size
+        height, width = (len(puzzles[0]['output']), len(puzzles[0]['output'][0])) if len(puzzles) > 0 else (0, 0)
+        codes = [
+            [int(idx) * len(cls.DIR_CHARS) + cls.DIR_CHARS.index(char) for idx, char in re.findall(r'(\d+)([UDRL])', puzzle['process'])]
+            for puzzle in puzzles
+        ]
+        move_size = 1 if max([max(puzzle_codes, default=0) for puzzle_codes in codes], default=0) < 1 << 8 else 2
+
+        records = list()
+        for puzzle, puzzle_codes in zip(puzzles, codes):
+            if len(puzzle['output']) != height or any([len(row) != width for row in puzzle['output']]):
+                raise ValueError(f'every board of a puzzle file must be {height}x{width}.')
+            records.append(b''.join([
+                cls.RECORD.pack(len(puzzle_codes), puzzle.get('states', 0)),
+                struct.pack(f'<{height * width}b', *[idx for row in puzzle['output'] for idx in row]),
+                struct.pack(f'<{len(puzzle_codes)}{"B" if move_size == 1 else "H"}', *puzzle_codes),
+            ]))
+
+        offset = cls.HEADER.size + cls.OFFSET.size * len(records)
+        offsets = list()
+        for record in records:
+            offsets.append(offset)
+            offset += len(record)
+
+        with modules.atomic_file.open_atomic(filepath) as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, height, width, move_size, len(records)))
+            f.write(b''.join([cls.OFFSET.pack(offset) for offset in offsets]))
+            f.write(b''.join(records))
+        return len(records)
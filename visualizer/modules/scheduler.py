@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Motion:
+    block_idx: int
+    start: list
+    end: list
+    # cells the block leaves and enters, two motions sharing a cell never run together
+    mask: int
+    elapsed: float = 0
+
+
+class Scheduler:
+
+    def __init__(self, moves_per_second: float):
+        self.__duration = 1000 / moves_per_second
+        self.__pending = list()
+        self.__running = list()
+
+    def push(self, block_idx: int, start: list, end: list, mask: int):
+        self.__pending.append(Motion(block_idx, start, end, mask))
+
+    def advance(self, elapsed: float) -> list:
+        # start every pending motion whose cells are free of running motions and of the motions queued before it
+        busy = 0
+        for motion in self.__running:
+            busy |= motion.mask
+        pending = list()
+        for motion in self.__pending:
+            if motion.mask & busy:
+                pending.append(motion)
+            else:
+                self.__running.append(motion)
+            busy |= motion.mask
+        self.__pending = pending
+
+        # (block index, top left, is done) of every running motion, positions follow the elapsed time, not the frame count
+        positions = list()
+        running = list()
+        for motion in self.__running:
+            motion.elapsed += elapsed
+            progress = min(motion.elapsed / self.__duration, 1)
+            # a finished motion ends exactly on its integer target
+            positions.append((
+                motion.block_idx,
+                list(motion.end) if progress == 1 else [start + (end - start) * progress for start, end in zip(motion.start, motion.end)],
+                progress == 1,
+            ))
+            if progress < 1:
+                running.append(motion)
+        self.__running = running
+        return positions
+
+    def clear(self):
+        self.__pending.clear()
+        self.__running.clear()
+
+    def is_busy(self) -> bool:
+        return len(self.__pending) > 0 or len(self.__running) > 0
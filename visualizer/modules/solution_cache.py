@@ -0,0 +1,54 @@
+import collections
+import sqlite3
+
+
+class SolutionCache:
+
+    def __init__(self, filepath: str, layout: str, capacity: int = 65536):
+        self.__layout = layout
+        self.__capacity = capacity
+        self.__entries = collections.OrderedDict()
+
+        self.__connection = sqlite3.connect(filepath)
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS solutions ('
+            'layout TEXT NOT NULL, key BLOB NOT NULL, distance INTEGER NOT NULL, move INTEGER NOT NULL, '
+            'PRIMARY KEY (layout, key))'
+        )
+        self.__connection.commit()
+
+    def get(self, key: int):
+        if key in self.__entries:
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+        row = self.__connection.execute(
+            'SELECT distance, move FROM solutions WHERE layout = ? AND key = ?',
+            (self.__layout, self.__pack(key)),
+        ).fetchone()
+        if row is None:
+            return None
+        self.__remember(key, tuple(row))
+        return tuple(row)
+
+    def put(self, entries: list):
+        # entries: (key, distance to the goal, next move) of every state on a solved path
+        for key, distance, move in entries:
+            self.__remember(key, (distance, move))
+        self.__connection.executemany(
+            'INSERT OR REPLACE INTO solutions (layout, key, distance, move) VALUES (?, ?, ?, ?)',
+            [(self.__layout, self.__pack(key), distance, move) for key, distance, move in entries],
+        )
+        self.__connection.commit()
+
+    def close(self):
+        self.__connection.close()
+
+    def __remember(self, key: int, entry: tuple):
+        self.__entries[key] = entry
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__capacity:
+            self.__entries.popitem(last=False)
+
+    def __pack(self, key: int) -> bytes:
+        return key.to_bytes((key.bit_length() + 7) // 8, 'little')
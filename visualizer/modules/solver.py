@@ -0,0 +1,816 @@
+import collections
+from dataclasses import dataclass
+import heapq
+import logging
+import math
+import re
+import sys
+import time
+
+import modules.move_table
+
+
+class SolvingCancelled(Exception):
+    pass
+
+
+class SearchStopped(Exception):
+    # thrown into a search at a progress snapshot once a budget is used up
+    pass
+
+
+@dataclass(slots=True)
+class Progress:
+    depth: int
+    frontier: int
+    states: int
+    # rough bytes of the visited table and the frontier
+    memory: int
+    seconds: float = 0
+
+
+class Solver:
+
+    # opposite directions are paired so that d ^ 1 reverses direction d
+    DIR2VEC = modules.move_table.MoveTable.DIR2VEC
+    DIR_CHARS = modules.move_table.MoveTable.DIR_CHARS
+    FORWARD = 0
+    BACKWARD = 1
+    # expansions between progress reports and cancellation checks
+    REPORT_INTERVAL = 1024
+    # states idastar remembers per iteration to skip transpositions, a full table only stops growing
+    TRANSPOSITION_LIMIT = 1 << 20
+
+    def __init__(self, board: list, block_types: list, goal: dict):
+        self.__height = len(board)
+        self.__width = len(board[0])
+        self.__cell_num = self.__height * self.__width
+        self.__block_num = max([max(idxs) for idxs in board]) + 1
+        self.__anchor_bits = self.__cell_num.bit_length()
+        self.__code_num = self.__block_num * len(self.DIR_CHARS)
+
+        self.__goal_block = int(list(goal.keys())[0])
+        goal_mask = 0
+        for coord in list(goal.values())[0]:
+            goal_mask |= 1 << (coord[0] * self.__width + coord[1])
+
+        # cell offsets, masks and on-board steps of every block come from the table the board shares
+        move_table = modules.move_table.MoveTable(board)
+        self.__offsets = [move_table.get_offsets(b) for b in range(self.__block_num)]
+
+        # blocks sharing a type and a geometry are interchangeable for deduplication, except the goal block
+        groups = dict()
+        self.__groups = [groups.setdefault((block_types[b], tuple(self.__offsets[b]), b == self.__goal_block), len(groups)) for b in range(self.__block_num)]
+
+        self.__masks = [[move_table.get_mask(b, p) for p in range(self.__cell_num)] for b in range(self.__block_num)]
+        self.__goal_anchors = frozenset([p for p, mask in enumerate(self.__masks[self.__goal_block]) if mask is not None and mask & goal_mask == goal_mask])
+
+        # the goal block moves one cell per move, so its manhattan distance to the goal is a lower bound
+        self.__goal_distances = [
+            min([abs(p // self.__width - q // self.__width) + abs(p % self.__width - q % self.__width) for q in self.__goal_anchors], default=math.inf)
+            for p in range(self.__cell_num)
+        ]
+        self.__pattern_database = None
+        self.__solution_cache = None
+        self.__distance_table = None
+
+        # mirror_anchors[b][p]: anchor of block b at p once the board is mirrored left to right,
+        # None unless every block and the goal look the same in the mirror
+        self.__mirror_anchors = self.__get_mirror_anchors()
+
+        # moves[b * cell_num + p]: (code, next anchor, anchor delta, cells to be empty, occupancy toggle, key toggle, mirror key toggle, is goal)
+        self.__moves = [None] * (self.__block_num * self.__cell_num)
+        for b in range(self.__block_num):
+            shift = b * self.__anchor_bits
+            key_base = self.__groups[b] * self.__cell_num
+            for p in range(self.__cell_num):
+                mask = self.__masks[b][p]
+                if mask is None:
+                    continue
+                moves = list()
+                for d, next_p, need in move_table.get_steps(b, p):
+                    next_mask = self.__masks[b][next_p]
+                    moves.append((
+                        b * len(self.DIR_CHARS) + d,
+                        next_p,
+                        (next_p - p) << shift,
+                        need,
+                        mask ^ next_mask,
+                        (1 << (key_base + p)) | (1 << (key_base + next_p)),
+                        # without mirror symmetry the mirror key follows the key itself, so the smaller of the two is always the key
+                        (1 << (key_base + self.__mirror_anchors[b][p])) | (1 << (key_base + self.__mirror_anchors[b][next_p])) if self.is_symmetric()
+                        else (1 << (key_base + p)) | (1 << (key_base + next_p)),
+                        b == self.__goal_block and next_p in self.__goal_anchors,
+                    ))
+                self.__moves[b * self.__cell_num + p] = tuple(moves)
+
+        self.__states = 0
+        self.__expanded = 0
+        self.__peak_frontier = 0
+        self.__monitor = None
+        self.__is_partial = False
+
+        # bytes of a visited entry and of a frontier entry, the memory budget is checked against these estimates
+        key_size = sys.getsizeof(1 << ((max(self.__groups) + 1) * self.__cell_num))
+        self.__state_size = 2 * key_size + 32
+        self.__frontier_entry_size = sys.getsizeof((0, 0, 0, 0)) + 4 * key_size
+
+    def solve(self, board: list, method: str = 'bfs', time_limit: float = None, node_limit: int = None, memory_limit: int = None) -> tuple:
+        search = self.iter_solve(board, method, time_limit, node_limit, memory_limit)
+        while True:
+            try:
+                progress = next(search)
+            except StopIteration as stop:
+                return stop.value
+            if self.__monitor is not None:
+                self.__monitor(progress.states, progress.frontier)
+
+    def iter_solve(self, board: list, method: str = 'bfs', time_limit: float = None, node_limit: int = None, memory_limit: int = None):
+        # yields a Progress every REPORT_INTERVAL expansions and returns (steps, process),
+        # once time (seconds), node (states) or memory (bytes) runs out the path to the state closest to the goal is returned instead
+        self.__is_partial = False
+        answer = self.get_known_answer(board)
+        if answer is not None:
+            return answer
+
+        start = time.perf_counter()
+        search = self.__search(board, method)
+        try:
+            progress = next(search)
+            while True:
+                progress.seconds = time.perf_counter() - start
+                yield progress
+                if (
+                    (time_limit is not None and progress.seconds >= time_limit)
+                    or (node_limit is not None and progress.states >= node_limit)
+                    or (memory_limit is not None and progress.memory >= memory_limit)
+                ):
+                    self.__is_partial = True
+                    progress = search.throw(SearchStopped())
+                else:
+                    progress = next(search)
+        except StopIteration as stop:
+            answer = stop.value
+
+        if not self.__is_partial:
+            self.remember_answer(board, answer)
+        return answer
+
+    def is_partial(self) -> bool:
+        # whether the last answer stops short of the goal because a budget ran out
+        return self.__is_partial
+
+    def get_known_answer(self, board: list):
+        # answers that need no search, from the distance table or the solution cache
+        if self.__distance_table is not None:
+            answer = self.__get_table_answer(board)
+            if answer is not None:
+                return answer
+        if self.__solution_cache is not None:
+            answer = self.__get_cached_answer(board)
+            if answer is not None:
+                return answer
+        return None
+
+    def remember_answer(self, board: list, answer: tuple):
+        if self.__solution_cache is not None and answer[0] is not None:
+            self.__cache_answer(board, answer[1])
+
+    def __search(self, board: list, method: str):
+        # every search is a generator of progress snapshots returning its answer
+        if method == 'bfs':
+            return self.bfs(board)
+        if method == 'bidirectional':
+            return self.bidirectional_bfs(board)
+        if method == 'astar':
+            return self.astar(board)
+        if method == 'idastar':
+            return self.idastar(board)
+        raise ValueError(f'unknown solving method: {method}')
+
+    def bfs(self, board: list) -> tuple:
+        anchors, occupancy, key = self.encode(board)
+        if self.is_goal(anchors):
+            self.__finish(1, 0)
+            return (0, '')
+        mirror_key = self.get_mirror_key(anchors)
+
+        moves = self.__moves
+        cell_num = self.__cell_num
+        code_num = self.__code_num
+        anchor_bits = self.__anchor_bits
+        anchor_mask = (1 << anchor_bits) - 1
+        block_num = self.__block_num
+
+        # visited[key]: side for a root, otherwise (parent key * code_num + code) * 2 + side,
+        # a state and its mirror image share the smaller of their keys since they are equally far from the symmetric goal
+        visited = {min(key, mirror_key): self.FORWARD}
+        que = collections.deque()
+        que.append((anchors, occupancy, key, mirror_key))
+
+        expanded = 0
+        self.__peak_frontier = 0
+        while len(que) > 0:
+            anchors, occupancy, key, mirror_key = que.popleft()
+            expanded += 1
+            if expanded % self.REPORT_INTERVAL == 0:
+                try:
+                    yield self.__get_progress(len(self.__trace(visited, min(key, mirror_key))[1]), len(visited), len(que))
+                except SearchStopped:
+                    self.__finish(len(visited), expanded)
+                    candidates = [(anchors, key, min(key, mirror_key))] + [(entry[0], entry[2], min(entry[2], entry[3])) for entry in que]
+                    return self.__get_partial_answer(visited, candidates)
+            packed_parent = min(key, mirror_key) * code_num
+            shifted = anchors
+            for b in range(block_num):
+                p = shifted & anchor_mask
+                shifted >>= anchor_bits
+                for code, _, delta, need, toggle, key_toggle, mirror_toggle, is_goal in moves[b * cell_num + p]:
+                    if occupancy & need:
+                        continue
+                    next_key = key ^ key_toggle
+                    next_mirror_key = mirror_key ^ mirror_toggle
+                    canonical_key = next_key if next_key < next_mirror_key else next_mirror_key
+                    if canonical_key in visited:
+                        continue
+                    visited[canonical_key] = (packed_parent + code) << 1
+                    if is_goal:
+                        self.__finish(len(visited), expanded)
+                        return self.__get_answer(self.__trace(visited, canonical_key)[1])
+                    que.append((anchors + delta, occupancy ^ toggle, next_key, next_mirror_key))
+
+        self.__finish(len(visited), expanded)
+        logging.debug(f'no answer found in {self.__states} states.')
+        return (None, None)
+
+    def bidirectional_bfs(self, board: list) -> tuple:
+        start = self.encode(board)
+        if self.is_goal(start[0]):
+            self.__finish(1, 0)
+            return (0, '')
+        start = (*start, self.get_mirror_key(start[0]))
+
+        moves = self.__moves
+        cell_num = self.__cell_num
+        code_num = self.__code_num
+        anchor_bits = self.__anchor_bits
+        anchor_mask = (1 << anchor_bits) - 1
+        block_num = self.__block_num
+
+        # every goal arrangement seeds the backward search, most of them are never reached from the start,
+        # so they are enumerated only as far as the forward frontier has grown and join the index once they are the smaller side
+        goal_states = self.__iter_goal_states()
+        seeds = dict()
+        is_enumerated = False
+        is_seeded = False
+
+        # both searches share one index keyed as in bfs, the side is kept in the lowest bit
+        visited = {min(start[2], start[3]): self.FORWARD}
+        roots = {min(start[2], start[3]): start[0]}
+        frontiers = [[start], list()]
+
+        expanded = 0
+        self.__peak_frontier = 0
+        # levels expanded on each side, their sum is the depth reached
+        depths = [0, 0]
+        while len(frontiers[self.FORWARD]) > 0 and (not is_seeded or len(frontiers[self.BACKWARD]) > 0):
+            while not is_enumerated and len(seeds) <= len(frontiers[self.FORWARD]):
+                seed = next(goal_states, None)
+                if seed is None:
+                    is_enumerated = True
+                    break
+                seed = (*seed, self.get_mirror_key(seed[0]))
+                seeds.setdefault(min(seed[2], seed[3]), seed)
+            if not is_seeded and is_enumerated and len(frontiers[self.FORWARD]) > len(seeds):
+                # the forward search has not met a goal yet, so none of the seeds is visited
+                for seed_key, seed in seeds.items():
+                    visited[seed_key] = self.BACKWARD
+                    roots[seed_key] = seed[0]
+                    frontiers[self.BACKWARD].append(seed)
+                is_seeded = True
+            side = self.FORWARD if not is_seeded or len(frontiers[self.FORWARD]) <= len(frontiers[self.BACKWARD]) else self.BACKWARD
+            next_frontier = list()
+            meetings = list()
+            for anchors, occupancy, key, mirror_key in frontiers[side]:
+                expanded += 1
+                if expanded % self.REPORT_INTERVAL == 0:
+                    try:
+                        yield self.__get_progress(sum(depths), len(visited), len(frontiers[1 - side]) + len(next_frontier))
+                    except SearchStopped:
+                        # the forward frontier is traced from the start whichever side is being expanded
+                        self.__finish(len(visited), expanded)
+                        return self.__get_partial_answer(visited, [(entry[0], entry[2], min(entry[2], entry[3])) for entry in frontiers[self.FORWARD]])
+                parent_key = min(key, mirror_key)
+                packed_parent = parent_key * code_num
+                shifted = anchors
+                for b in range(block_num):
+                    p = shifted & anchor_mask
+                    shifted >>= anchor_bits
+                    for code, _, delta, need, toggle, key_toggle, mirror_toggle, is_goal in moves[b * cell_num + p]:
+                        if occupancy & need:
+                            continue
+                        next_key = key ^ key_toggle
+                        next_mirror_key = mirror_key ^ mirror_toggle
+                        canonical_key = next_key if next_key < next_mirror_key else next_mirror_key
+                        value = visited.get(canonical_key)
+                        if value is None:
+                            visited[canonical_key] = ((packed_parent + code) << 1) | side
+                            if is_goal and not is_seeded:
+                                # until the seeding the search is a plain bfs, and so is its first goal
+                                self.__finish(len(visited), expanded)
+                                return self.__get_answer(self.__trace(visited, canonical_key)[1])
+                            next_frontier.append((anchors + delta, occupancy ^ toggle, next_key, next_mirror_key))
+                        elif value & 1 != side:
+                            meetings.append((parent_key, code, canonical_key))
+            frontiers[side] = next_frontier
+            depths[side] += 1
+            logging.debug(f'frontier sizes: {len(frontiers[self.FORWARD])}, {len(frontiers[self.BACKWARD])}')
+
+            if len(meetings) == 0:
+                continue
+
+            # every meeting in this level shares the depth on the expanded side, so pick the shallowest on the other side
+            self.__finish(len(visited), expanded)
+            paths = list()
+            for key, code, next_key in meetings:
+                this_root, this_codes = self.__trace(visited, key)
+                other_root, other_codes = self.__trace(visited, next_key)
+                this_codes.append(code)
+                if side == self.FORWARD:
+                    paths.append((len(other_codes), this_root, this_codes, other_root, other_codes))
+                else:
+                    paths.append((len(this_codes), other_root, other_codes, this_root, this_codes))
+            _, forward_root, forward_codes, backward_root, backward_codes = min(paths, key=lambda path: path[0])
+            return self.__get_answer(self.__stitch(roots[forward_root], forward_codes, roots[backward_root], backward_codes))
+
+        self.__finish(len(visited), expanded)
+        logging.debug(f'no answer found in {self.__states} states.')
+        return (None, None)
+
+    def astar(self, board: list) -> tuple:
+        anchors, occupancy, key = self.encode(board)
+        mirror_key = self.get_mirror_key(anchors)
+        heuristic = self.get_heuristic
+        h = heuristic(anchors, key)
+        if h == math.inf:
+            self.__finish(1, 0)
+            return (None, None)
+
+        moves = self.__moves
+        cell_num = self.__cell_num
+        code_num = self.__code_num
+        anchor_bits = self.__anchor_bits
+        anchor_mask = (1 << anchor_bits) - 1
+        block_num = self.__block_num
+
+        # states are keyed as in bfs
+        visited = {min(key, mirror_key): self.FORWARD}
+        costs = {min(key, mirror_key): 0}
+        heap = [(h, h, anchors, occupancy, key, mirror_key)]
+
+        expanded = 0
+        self.__peak_frontier = 0
+        while len(heap) > 0:
+            f, h, anchors, occupancy, key, mirror_key = heapq.heappop(heap)
+            cost = f - h
+            canonical_key = min(key, mirror_key)
+            if cost > costs[canonical_key]:
+                continue
+            expanded += 1
+            if expanded % self.REPORT_INTERVAL == 0:
+                try:
+                    yield self.__get_progress(cost, len(visited), len(heap))
+                except SearchStopped:
+                    self.__finish(len(visited), expanded)
+                    candidates = [(anchors, key, canonical_key)] + [(entry[2], entry[4], min(entry[4], entry[5])) for entry in heap]
+                    return self.__get_partial_answer(visited, candidates)
+            if h == 0 and self.is_goal(anchors):
+                self.__finish(len(visited), expanded)
+                return self.__get_answer(self.__trace(visited, canonical_key)[1])
+
+            packed_parent = canonical_key * code_num
+            next_cost = cost + 1
+            shifted = anchors
+            for b in range(block_num):
+                p = shifted & anchor_mask
+                shifted >>= anchor_bits
+                for code, _, delta, need, toggle, key_toggle, mirror_toggle, _ in moves[b * cell_num + p]:
+                    if occupancy & need:
+                        continue
+                    next_key = key ^ key_toggle
+                    next_mirror_key = mirror_key ^ mirror_toggle
+                    canonical_key = next_key if next_key < next_mirror_key else next_mirror_key
+                    if costs.get(canonical_key, math.inf) <= next_cost:
+                        continue
+                    next_anchors = anchors + delta
+                    h = heuristic(next_anchors, next_key)
+                    if h == math.inf:
+                        continue
+                    costs[canonical_key] = next_cost
+                    visited[canonical_key] = (packed_parent + code) << 1
+                    heapq.heappush(heap, (next_cost + h, h, next_anchors, occupancy ^ toggle, next_key, next_mirror_key))
+
+        self.__finish(len(visited), expanded)
+        logging.debug(f'no answer found in {self.__states} states.')
+        return (None, None)
+
+    def idastar(self, board: list) -> tuple:
+        anchors, occupancy, key = self.encode(board)
+        if self.is_goal(anchors):
+            self.__finish(1, 0)
+            return (0, '')
+
+        moves = self.__moves
+        cell_num = self.__cell_num
+        anchor_bits = self.__anchor_bits
+        anchor_mask = (1 << anchor_bits) - 1
+        block_num = self.__block_num
+        heuristic = self.get_heuristic
+
+        # only the current path is kept, so memory grows with the depth instead of the state space,
+        # apart from the bounded table of the lowest cost every state was searched from in this iteration
+        path = {key}
+        costs = dict()
+        codes = list()
+        generated = 1
+        self.__peak_frontier = 0
+        # the path to the state of the lowest heuristic so far, the answer when a budget runs out
+        best_h, best_codes = heuristic(anchors, key), list()
+
+        def search(anchors: int, occupancy: int, key: int, cost: int, bound: int, last_code: int):
+            nonlocal generated, best_h, best_codes
+            next_bound = math.inf
+            shifted = anchors
+            for b in range(block_num):
+                p = shifted & anchor_mask
+                shifted >>= anchor_bits
+                for code, _, delta, need, toggle, key_toggle, _, is_goal in moves[b * cell_num + p]:
+                    if occupancy & need or code == last_code ^ 1:
+                        continue
+                    next_key = key ^ key_toggle
+                    if next_key in path or costs.get(next_key, math.inf) <= cost + 1:
+                        continue
+                    generated += 1
+                    if generated % self.REPORT_INTERVAL == 0:
+                        yield self.__get_progress(len(path), generated, len(path), len(path) + len(costs))
+                    if is_goal:
+                        codes.append(code)
+                        return None
+                    next_anchors = anchors + delta
+                    h = heuristic(next_anchors, next_key)
+                    if h < best_h:
+                        best_h, best_codes = h, codes + [code]
+                    f = cost + 1 + h
+                    if f > bound:
+                        next_bound = min(next_bound, f)
+                        continue
+                    # the same bound left at least as much to search from a lower cost
+                    if len(costs) < self.TRANSPOSITION_LIMIT or next_key in costs:
+                        costs[next_key] = cost + 1
+                    path.add(next_key)
+                    codes.append(code)
+                    f = yield from search(next_anchors, occupancy ^ toggle, next_key, cost + 1, bound, code)
+                    if f is None:
+                        return None
+                    path.remove(next_key)
+                    codes.pop()
+                    next_bound = min(next_bound, f)
+            return next_bound
+
+        bound = heuristic(anchors, key)
+        while bound != math.inf:
+            logging.debug(f'bound: {bound}, generated: {generated}')
+            costs.clear()
+            try:
+                bound = yield from search(anchors, occupancy, key, 0, bound, -2)
+            except SearchStopped:
+                self.__finish(generated, generated)
+                return self.__get_answer(best_codes)
+            if bound is None:
+                self.__finish(generated, generated)
+                return self.__get_answer(codes)
+
+        self.__finish(generated, generated)
+        logging.debug(f'no answer found in {self.__states} states.')
+        return (None, None)
+
+    def get_distances(self, states: list) -> dict:
+        moves = self.__moves
+        cell_num = self.__cell_num
+        anchor_bits = self.__anchor_bits
+        anchor_mask = (1 << anchor_bits) - 1
+        block_num = self.__block_num
+
+        distances = dict()
+        que = collections.deque()
+        for anchors, occupancy, key in states:
+            if key not in distances:
+                distances[key] = 0
+                que.append((anchors, occupancy, key))
+
+        expanded = 0
+        self.__peak_frontier = 0
+        while len(que) > 0:
+            anchors, occupancy, key = que.popleft()
+            expanded += 1
+            if expanded % self.REPORT_INTERVAL == 0:
+                self.__report(len(distances), len(que))
+            distance = distances[key] + 1
+            shifted = anchors
+            for b in range(block_num):
+                p = shifted & anchor_mask
+                shifted >>= anchor_bits
+                for _, _, delta, need, toggle, key_toggle, _, _ in moves[b * cell_num + p]:
+                    if occupancy & need:
+                        continue
+                    next_key = key ^ key_toggle
+                    if next_key in distances:
+                        continue
+                    distances[next_key] = distance
+                    que.append((anchors + delta, occupancy ^ toggle, next_key))
+
+        self.__finish(len(distances), expanded)
+        return distances
+
+    def get_heuristic(self, anchors: int, key: int) -> int:
+        h = self.__goal_distances[(anchors >> (self.__goal_block * self.__anchor_bits)) & ((1 << self.__anchor_bits) - 1)]
+        if self.__pattern_database is not None:
+            h = max(h, self.__pattern_database.lookup(key))
+        return h
+
+    def set_pattern_database(self, pattern_database):
+        self.__pattern_database = pattern_database
+
+    def set_distance_table(self, distance_table):
+        self.__distance_table = distance_table
+
+    def set_solution_cache(self, solution_cache):
+        self.__solution_cache = solution_cache
+
+    def get_signature(self) -> str:
+        return repr((self.__height, self.__width, self.__offsets, self.__groups, sorted(self.__goal_anchors)))
+
+    def get_groups(self) -> list:
+        return self.__groups.copy()
+
+    def get_shapes(self) -> list:
+        return [offsets.copy() for offsets in self.__offsets]
+
+    def get_cell_num(self) -> int:
+        return self.__cell_num
+
+    def get_states(self) -> int:
+        return self.__states
+
+    def get_stats(self) -> dict:
+        # counters of the last search, the peak frontier is sampled at every progress report
+        return {'states': self.__states, 'expanded': self.__expanded, 'peak_frontier': self.__peak_frontier}
+
+    def set_monitor(self, monitor):
+        # monitor(states seen, states waiting to be expanded) may raise SolvingCancelled to stop the search
+        self.__monitor = monitor
+
+    def encode(self, board: list) -> tuple:
+        anchors, occupancy, key = 0, 0, 0
+        seen = set()
+        for i in range(self.__height):
+            for j in range(self.__width):
+                b = board[i][j]
+                if b == -1 or b in seen:
+                    continue
+                seen.add(b)
+                p = i * self.__width + j
+                anchors |= p << (b * self.__anchor_bits)
+                occupancy |= self.__masks[b][p]
+                key |= 1 << (self.__groups[b] * self.__cell_num + p)
+        return (anchors, occupancy, key)
+
+    def decode(self, anchors: int) -> list:
+        board = [[-1] * self.__width for _ in range(self.__height)]
+        for b in range(self.__block_num):
+            p = (anchors >> (b * self.__anchor_bits)) & ((1 << self.__anchor_bits) - 1)
+            for di, dj in self.__offsets[b]:
+                board[p // self.__width + di][p % self.__width + dj] = b
+        return board
+
+    def get_successors(self, anchors: int, occupancy: int, key: int) -> list:
+        successors = list()
+        for b in range(self.__block_num):
+            p = (anchors >> (b * self.__anchor_bits)) & ((1 << self.__anchor_bits) - 1)
+            for code, _, delta, need, toggle, key_toggle, _, _ in self.__moves[b * self.__cell_num + p]:
+                if occupancy & need:
+                    continue
+                successors.append((code, anchors + delta, occupancy ^ toggle, key ^ key_toggle))
+        return successors
+
+    def get_process(self, codes: list) -> str:
+        return ''.join([f'{code // len(self.DIR_CHARS)}{self.DIR_CHARS[code % len(self.DIR_CHARS)]}' for code in codes])
+
+    def get_key(self, anchors: int) -> int:
+        key = 0
+        for b in range(self.__block_num):
+            p = (anchors >> (b * self.__anchor_bits)) & ((1 << self.__anchor_bits) - 1)
+            key |= 1 << (self.__groups[b] * self.__cell_num + p)
+        return key
+
+    def get_mirror_key(self, anchors: int) -> int:
+        # the key of the mirror image, or the key itself on a layout without mirror symmetry
+        if not self.is_symmetric():
+            return self.get_key(anchors)
+        return self.get_key(self.mirror(anchors))
+
+    def mirror(self, anchors: int) -> int:
+        mirrored = 0
+        for b in range(self.__block_num):
+            p = (anchors >> (b * self.__anchor_bits)) & ((1 << self.__anchor_bits) - 1)
+            mirrored |= self.__mirror_anchors[b][p] << (b * self.__anchor_bits)
+        return mirrored
+
+    def is_symmetric(self) -> bool:
+        return self.__mirror_anchors is not None
+
+    def is_goal(self, anchors: int) -> bool:
+        shift = self.__goal_block * self.__anchor_bits
+        return (anchors >> shift) & ((1 << self.__anchor_bits) - 1) in self.__goal_anchors
+
+    def get_goal_states(self) -> list:
+        # every arrangement with the goal block on a goal anchor, one per shape-canonical key
+        return list(self.__iter_goal_states())
+
+    def apply(self, anchors: int, code: int) -> int:
+        b = code // len(self.DIR_CHARS)
+        p = (anchors >> (b * self.__anchor_bits)) & ((1 << self.__anchor_bits) - 1)
+        for move in self.__moves[b * self.__cell_num + p]:
+            if move[0] == code:
+                return anchors + move[2]
+        raise ValueError(f'block {b} cannot be moved to {self.DIR_CHARS[code % len(self.DIR_CHARS)]}.')
+
+    def __iter_goal_states(self):
+        order = [self.__goal_block] + [b for b in range(self.__block_num) if b != self.__goal_block]
+        # interchangeable blocks take increasing anchors, later[i]: blocks of the same group placed after order[i],
+        # each of them needs a free anchor after the one of order[i]
+        later = [sum([self.__groups[b] == self.__groups[order[i]] for b in order[i + 1:]]) for i in range(len(order))]
+        cells = (1 << self.__cell_num) - 1
+
+        def place(i: int, anchors: int, occupancy: int, key: int, last_anchors: dict):
+            if i == len(order):
+                yield (anchors, occupancy, key)
+                return
+            b = order[i]
+            group = self.__groups[b]
+            candidates = self.__goal_anchors if b == self.__goal_block else range(last_anchors.get(group, -1) + 1, self.__cell_num)
+            for p in candidates:
+                mask = self.__masks[b][p]
+                if mask is None or occupancy & mask:
+                    continue
+                if later[i] > 0 and bin((cells & ~(occupancy | mask)) >> (p + 1)).count('1') < later[i]:
+                    # a later anchor only leaves fewer cells after it
+                    break
+                yield from place(
+                    i + 1,
+                    anchors | (p << (b * self.__anchor_bits)),
+                    occupancy | mask,
+                    key | (1 << (group * self.__cell_num + p)),
+                    {**last_anchors, group: p},
+                )
+
+        return place(0, 0, 0, 0, dict())
+
+    def __finish(self, states: int, expanded: int):
+        self.__states = states
+        self.__expanded = expanded
+
+    def __report(self, states: int, frontier: int):
+        self.__peak_frontier = max(self.__peak_frontier, frontier)
+        if self.__monitor is not None:
+            self.__monitor(states, frontier)
+
+    def __get_progress(self, depth: int, states: int, frontier: int, kept_states: int = None) -> Progress:
+        # kept_states: states held in memory when the search does not keep every state it has seen
+        self.__peak_frontier = max(self.__peak_frontier, frontier)
+        kept_states = states if kept_states is None else kept_states
+        return Progress(depth, frontier, states, kept_states * self.__state_size + frontier * self.__frontier_entry_size)
+
+    def __get_partial_answer(self, visited: dict, candidates: list) -> tuple:
+        # candidates: (anchors, key, visited key) of traced states, the path to the one of the lowest heuristic is taken
+        if len(candidates) == 0:
+            return (None, None)
+        _, _, canonical_key = min(candidates, key=lambda candidate: self.get_heuristic(candidate[0], candidate[1]))
+        codes = self.__trace(visited, canonical_key)[1]
+        logging.debug(f'search stopped after {self.__states} states, {len(codes)} moves towards the goal are returned.')
+        return (len(codes), self.get_process(codes))
+
+    def __get_table_answer(self, board: list):
+        # walk down the distance gradient, every state on the way is in the table as well
+        anchors, occupancy, key = self.encode(board)
+        distance = self.__distance_table.lookup(key)
+        if distance is None:
+            return None
+        codes = list()
+        while distance > 0:
+            for code, anchors, occupancy, key in self.get_successors(anchors, occupancy, key):
+                if self.__distance_table.lookup(key) == distance - 1:
+                    break
+            else:
+                return None
+            codes.append(code)
+            distance -= 1
+        self.__finish(0, 0)
+        logging.debug('answer found in the distance table.')
+        return (len(codes), self.get_process(codes))
+
+    def __get_cached_answer(self, board: list):
+        # cached moves name the anchor cell of the block, since interchangeable blocks may be labelled differently
+        anchors, _, key = self.encode(board)
+        entry = self.__solution_cache.get(key)
+        codes = list()
+        while entry is not None and entry[0] > 0:
+            p, d = divmod(entry[1], len(self.DIR_CHARS))
+            b = self.__get_block_idxs(anchors)[p]
+            codes.append(b * len(self.DIR_CHARS) + d)
+            anchors = self.apply(anchors, codes[-1])
+            entry = self.__solution_cache.get(self.get_key(anchors))
+        if entry is None:
+            return None
+        self.__finish(0, 0)
+        logging.debug('answer found in the solution cache.')
+        return (len(codes), self.get_process(codes))
+
+    def __cache_answer(self, board: list, process: str):
+        anchors = self.encode(board)[0]
+        codes = [int(idx) * len(self.DIR_CHARS) + self.DIR_CHARS.index(char) for idx, char in re.findall(r'(\d+)([UDRL])', process)]
+        entries = list()
+        for i, code in enumerate(codes):
+            b, d = divmod(code, len(self.DIR_CHARS))
+            p = (anchors >> (b * self.__anchor_bits)) & ((1 << self.__anchor_bits) - 1)
+            entries.append((self.get_key(anchors), len(codes) - i, p * len(self.DIR_CHARS) + d))
+            anchors = self.apply(anchors, code)
+        entries.append((self.get_key(anchors), 0, -1))
+        self.__solution_cache.put(entries)
+
+    def __get_block_idxs(self, anchors: int) -> dict:
+        anchor_mask = (1 << self.__anchor_bits) - 1
+        return {(anchors >> (b * self.__anchor_bits)) & anchor_mask: b for b in range(self.__block_num)}
+
+    def __trace(self, visited: dict, key: int) -> tuple:
+        codes = list()
+        value = visited[key]
+        while value > 1:
+            key, code = divmod(value >> 1, self.__code_num)
+            codes.append(code)
+            value = visited[key]
+        codes.reverse()
+        return (key, codes)
+
+    def __stitch(self, forward_root: int, forward_codes: list, backward_root: int, backward_codes: list) -> list:
+        forward_anchors, backward_anchors = forward_root, backward_root
+        for code in forward_codes:
+            forward_anchors = self.apply(forward_anchors, code)
+        for code in backward_codes:
+            backward_anchors = self.apply(backward_anchors, code)
+
+        # the backward search may have met the mirror image of the forward state, moving right becomes moving left there
+        if self.get_key(backward_anchors) != self.get_key(forward_anchors):
+            backward_anchors = self.mirror(backward_anchors)
+            backward_codes = [self.__mirror_code(code) for code in backward_codes]
+
+        # the backward search may label interchangeable blocks differently from the forward one
+        anchor_mask = (1 << self.__anchor_bits) - 1
+        block_idxs = {
+            (self.__groups[b], (forward_anchors >> (b * self.__anchor_bits)) & anchor_mask): b
+            for b in range(self.__block_num)
+        }
+        perm = [block_idxs[(self.__groups[b], (backward_anchors >> (b * self.__anchor_bits)) & anchor_mask)] for b in range(self.__block_num)]
+
+        codes = forward_codes.copy()
+        for code in reversed(backward_codes):
+            b, d = divmod(code, len(self.DIR_CHARS))
+            codes.append(perm[b] * len(self.DIR_CHARS) + (d ^ 1))
+        return codes
+
+    def __get_answer(self, codes: list) -> tuple:
+        logging.debug(f'answer found in {self.__states} states.')
+        return (len(codes), self.get_process(codes))
+
+    def __mirror_code(self, code: int) -> int:
+        b, d = divmod(code, len(self.DIR_CHARS))
+        dy, dx = self.DIR2VEC[self.DIR_CHARS[d]]
+        return b * len(self.DIR_CHARS) + list(self.DIR2VEC.values()).index((dy, -dx))
+
+    def __get_mirror_anchors(self):
+        def mirror(mask: int) -> int:
+            mirrored = 0
+            for p in range(self.__cell_num):
+                if mask >> p & 1:
+                    mirrored |= 1 << (p - p % self.__width + self.__width - 1 - p % self.__width)
+            return mirrored
+
+        mirror_anchors = list()
+        for b in range(self.__block_num):
+            anchors = {mask: p for p, mask in enumerate(self.__masks[b]) if mask is not None}
+            mirror_anchors.append([None if mask is None else anchors.get(mirror(mask)) for mask in self.__masks[b]])
+            if any([mask is not None and p is None for mask, p in zip(self.__masks[b], mirror_anchors[b])]):
+                return None
+        if frozenset([mirror_anchors[self.__goal_block][p] for p in self.__goal_anchors]) != self.__goal_anchors:
+            return None
+        return mirror_anchors
@@ -0,0 +1,154 @@
+import concurrent.futures
+import logging
+import multiprocessing
+import multiprocessing.util
+
+import modules.pattern_database
+import modules.solver
+
+# state of the worker process, set up once by _init_process
+_solver = None
+_backend = None
+_time_limit = None
+_generation = None
+_progress = None
+
+
+def create_solver(board: list, block_types: list, goal: dict, method: str, pattern_types: list = None, pattern_filepath: str = None, parallel_worker_num: int = None, memory_limit: int = 64 * 1024 * 1024) -> tuple:
+    # (solver, backend), the backend is None unless the method has its own search engine
+    solver = modules.solver.Solver(board, block_types, goal)
+    if pattern_types is not None:
+        solver.set_pattern_database(modules.pattern_database.PatternDatabase(board, block_types, goal, pattern_types, pattern_filepath))
+    return (solver, _create_backend(board, block_types, goal, method, parallel_worker_num, memory_limit))
+
+
+def _create_backend(board: list, block_types: list, goal: dict, method: str, parallel_worker_num: int, memory_limit: int):
+    # a backend and what it depends on, numpy for one, are only imported when its method is selected
+    if method == 'parallel':
+        import modules.parallel_solver
+        return modules.parallel_solver.ParallelSolver(board, block_types, goal, parallel_worker_num)
+    if method == 'numpy':
+        import modules.vectorized_solver
+        return modules.vectorized_solver.VectorizedSolver(board, block_types, goal)
+    if method == 'external':
+        import modules.external_solver
+        return modules.external_solver.ExternalSolver(board, block_types, goal, memory_limit)
+    return None
+
+
+def _init_process(board: list, block_types: list, goal: dict, method: str, pattern_types: list, pattern_filepath: str, parallel_worker_num: int, memory_limit: int, time_limit: float, generation, progress):
+    global _solver, _backend, _time_limit, _generation, _progress
+    _solver, _backend = create_solver(board, block_types, goal, method, pattern_types, pattern_filepath, parallel_worker_num, memory_limit)
+    if method == 'parallel':
+        # the search processes of the backend are stopped before the pool process exits, not left to find their pipe closed
+        multiprocessing.util.Finalize(_backend, _backend.close, exitpriority=10)
+    _time_limit = time_limit
+    _generation = generation
+    _progress = progress
+
+
+def _solve(board: list, method: str, generation: int):
+    def monitor(states: int, frontier: int):
+        _progress[0], _progress[1] = states, frontier
+        if _generation.value != generation:
+            raise modules.solver.SolvingCancelled()
+
+    if _generation.value != generation:
+        return None
+    _progress[0], _progress[1], _progress[2] = 0, 0, 0
+    if _backend is None:
+        # the search is stepped here, so the depth is shared too and the time limit applies
+        search = _solver.iter_solve(board, method, _time_limit)
+        try:
+            while True:
+                progress = next(search)
+                _progress[0], _progress[1], _progress[2] = progress.states, progress.frontier, progress.depth
+                if _generation.value != generation:
+                    return None
+        except StopIteration as stop:
+            steps, process = stop.value
+        return (steps, process, _solver.get_states(), _solver.is_partial())
+
+    _backend.set_monitor(monitor)
+    try:
+        steps, process = _backend.solve(board)
+    except modules.solver.SolvingCancelled:
+        return None
+    return (steps, process, _backend.get_states(), False)
+
+
+class SolvingWorker:
+
+    def __init__(self, board: list, block_types: list, goal: dict, method: str, pattern_types: list = None, pattern_filepath: str = None, parallel_worker_num: int = None, memory_limit: int = None, time_limit: float = None):
+        self.__method = method
+        # the search runs in its own process so that it never holds the gil of the render loop
+        self.__context = multiprocessing.get_context('spawn')
+        self.__generation = self.__context.Value('q', 0, lock=False)
+        self.__progress = self.__context.Array('q', 3, lock=False)
+        self.__initargs = (board, block_types, goal, method, pattern_types, pattern_filepath, parallel_worker_num, memory_limit, time_limit, self.__generation, self.__progress)
+        self.__executor = self.__create_executor()
+        self.__future = None
+
+    def submit(self, board: list):
+        self.cancel()
+        try:
+            self.__future = self.__executor.submit(_solve, board, self.__method, self.__generation.value)
+        except concurrent.futures.process.BrokenProcessPool:
+            # the process died while idle, the solve goes to a new one
+            self.__restart()
+            self.__future = self.__executor.submit(_solve, board, self.__method, self.__generation.value)
+
+    def cancel(self):
+        # bumping the generation makes the running solve stop at its next progress report
+        if self.__future is None:
+            return
+        if not self.__future.done():
+            logging.debug('stale solve is cancelled.')
+        self.__future.cancel()
+        self.__generation.value += 1
+        self.__future = None
+
+    def is_busy(self) -> bool:
+        return self.__future is not None and not self.__future.done()
+
+    def is_done(self) -> bool:
+        return self.__future is not None and self.__future.done()
+
+    def wait(self):
+        if self.__future is not None:
+            concurrent.futures.wait([self.__future])
+
+    def get_result(self):
+        # (steps, process, states, is partial), or None for a cancelled or failed solve,
+        # an error of the search is only logged so that it never stops the render loop
+        future, self.__future = self.__future, None
+        try:
+            return future.result()
+        except concurrent.futures.process.BrokenProcessPool as e:
+            logging.error(f'solving process is lost: {e}')
+            self.__restart()
+        except Exception as e:
+            logging.error(f'solving failed: {type(e).__name__}: {e}')
+        return None
+
+    def get_progress(self) -> tuple:
+        # (states, frontier, depth), the depth stays 0 for backends that do not report it
+        return (self.__progress[0], self.__progress[1], self.__progress[2])
+
+    def close(self):
+        self.cancel()
+        self.__generation.value += 1
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __create_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=self.__context,
+            initializer=_init_process,
+            initargs=self.__initargs,
+        )
+
+    def __restart(self):
+        # a broken pool takes no more work, the next solve starts a new process
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+        self.__executor = self.__create_executor()
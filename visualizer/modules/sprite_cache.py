@@ -0,0 +1,53 @@
+import pygame
+
+
+class SpriteCache:
+
+    def __init__(self):
+        self.__sprites = dict()
+
+    def get(self, size: tuple, color: tuple, radius: int = 0, cells: tuple = None, tile_size: tuple = None, gap: int = 0) -> pygame.Surface:
+        # a rect is rendered once per size, colour and radius, so a new tile size or palette simply misses the cache,
+        # cells: (i, j) of a block that is not a rectangle relative to its bounding box, drawn cell by cell into it
+        key = (tuple(size), tuple(color), radius, cells, None if tile_size is None else tuple(tile_size), gap)
+        sprite = self.__sprites.get(key)
+        if sprite is not None:
+            return sprite
+
+        # the corners get a colour the rect never has and are keyed out,
+        # an rle encoded colorkey blit is faster than per-pixel alpha and even than fill
+        transparent = tuple([255 - value for value in color[:3]])
+        sprite = pygame.Surface(size).convert()
+        sprite.fill(transparent)
+        if cells is None:
+            pygame.draw.rect(sprite, color, sprite.get_rect(), border_radius=radius)
+        else:
+            self.__draw_cells(sprite, color, radius, cells, tile_size, gap)
+        sprite.set_colorkey(transparent, pygame.RLEACCEL)
+        self.__sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        self.__sprites.clear()
+
+    def __len__(self) -> int:
+        return len(self.__sprites)
+
+    def __draw_cells(self, sprite: pygame.Surface, color: tuple, radius: int, cells: tuple, tile_size: tuple, gap: int):
+        # a cell keeps its gap and rounded corners only on the sides where no cell of the same block touches it,
+        # the sprite starts at the gap of the bounding box
+        for i, j in cells:
+            up, down, left, right = (i - 1, j) in cells, (i + 1, j) in cells, (i, j - 1) in cells, (i, j + 1) in cells
+            rect = pygame.Rect(
+                j * tile_size[0] + (0 if left else gap) - gap,
+                i * tile_size[1] + (0 if up else gap) - gap,
+                tile_size[0] - (0 if left else gap) - (0 if right else gap),
+                tile_size[1] - (0 if up else gap) - (0 if down else gap),
+            )
+            pygame.draw.rect(
+                sprite, color, rect,
+                border_top_left_radius=0 if up or left else radius,
+                border_top_right_radius=0 if up or right else radius,
+                border_bottom_left_radius=0 if down or left else radius,
+                border_bottom_right_radius=0 if down or right else radius,
+            )
@@ -0,0 +1,58 @@
+import json
+
+import pygame
+
+VERSION = 2
+# the events the app reacts to and the attributes it reads from them
+EVENT_TYPES = {
+    pygame.KEYDOWN: ('keydown', ('key',)),
+    pygame.MOUSEMOTION: ('mousemotion', ('pos',)),
+    pygame.MOUSEBUTTONDOWN: ('mousebuttondown', ('pos',)),
+    pygame.MOUSEBUTTONUP: ('mousebuttonup', ('pos',)),
+    pygame.QUIT: ('quit', ()),
+}
+NAME2TYPE = {name: event_type for event_type, (name, _) in EVENT_TYPES.items()}
+
+
+class TraceRecorder:
+
+    def __init__(self, filepath: str, board_info: dict):
+        # a json line of the board the trace starts from and its answer, then a json line per frame
+        self.__file = open(filepath, 'w')
+        self.__file.write(json.dumps({'version': VERSION, 'board': board_info['output'], 'process': board_info['process'], 'steps': board_info['steps']}) + '\n')
+
+    def record(self, elapsed: float, events: list):
+        # elapsed: milliseconds the frame before took, replaying it keeps the animations where they were
+        frame = {'elapsed': elapsed}
+        recorded = [self.__to_dict(event) for event in events if event.type in EVENT_TYPES]
+        if len(recorded) > 0:
+            frame['events'] = recorded
+        self.__file.write(json.dumps(frame) + '\n')
+
+    def close(self):
+        self.__file.close()
+
+    def __to_dict(self, event: pygame.event.Event) -> dict:
+        name, attributes = EVENT_TYPES[event.type]
+        recorded = {'type': name}
+        for attribute in attributes:
+            value = getattr(event, attribute)
+            recorded[attribute] = list(value) if isinstance(value, tuple) else value
+        return recorded
+
+
+def load(filepath: str) -> tuple:
+    # (board info with the keys of params.json, frames), frames: (elapsed, events) as they were recorded
+    with open(filepath, 'r') as f:
+        header = json.loads(f.readline())
+        if header.get('version') != VERSION:
+            raise ValueError(f'{filepath} is not a trace of version {VERSION}.')
+        frames = list()
+        for line in f:
+            frame = json.loads(line)
+            events = list()
+            for recorded in frame.get('events', list()):
+                attributes = {key: tuple(value) if isinstance(value, list) else value for key, value in recorded.items() if key != 'type'}
+                events.append(pygame.event.Event(NAME2TYPE[recorded['type']], **attributes))
+            frames.append((frame['elapsed'], events))
+    return ({'output': header['board'], 'process': header['process'], 'steps': header['steps']}, frames)
@@ -0,0 +1,122 @@
+import logging
+
+import numpy as np
+
+import modules.solver
+
+
+class VectorizedSolver:
+
+    def __init__(self, board: list, block_types: list, goal: dict):
+        self.__solver = modules.solver.Solver(board, block_types, goal)
+        self.__block_idxs = np.arange(max([max(idxs) for idxs in board]) + 1, dtype=np.int8)
+        self.__goal_block = int(list(goal.keys())[0])
+        self.__goal_coords = tuple(np.array(list(goal.values())[0]).T)
+
+        # cell value + 1 -> shape-canonical value, 0 stays the space
+        groups = self.__solver.get_groups()
+        self.__canonical_lut = np.array([0] + [group + 1 for group in groups], dtype=np.uint8)
+        self.__is_packable = max(groups) + 1 < 16
+        self.__states = 0
+        self.__expanded = 0
+        self.__peak_frontier = 0
+        self.__monitor = None
+
+    def solve(self, board: list) -> tuple:
+        frontier = np.array([board], dtype=np.int8)
+        if self.__is_goal(frontier)[0]:
+            self.__states, self.__expanded, self.__peak_frontier = 1, 0, 0
+            return (0, '')
+
+        visited = set(self.__get_keys(frontier))
+        # levels[i]: (index of the parent in level i - 1, move code) of every state in level i
+        levels = list()
+        self.__expanded, self.__peak_frontier = 0, 1
+
+        while len(frontier) > 0:
+            self.__expanded += len(frontier)
+            children, parent_idxs, codes = self.__expand(frontier)
+            if len(children) == 0:
+                # no block can move on any board of the level, there is nothing to key
+                self.__states = len(visited)
+                break
+            keys = self.__get_keys(children)
+
+            is_new = np.zeros(len(children), dtype=bool)
+            for i, key in enumerate(keys):
+                if key not in visited:
+                    visited.add(key)
+                    is_new[i] = True
+            frontier, parent_idxs, codes = children[is_new], parent_idxs[is_new], codes[is_new]
+            levels.append((parent_idxs, codes))
+            self.__peak_frontier = max(self.__peak_frontier, len(frontier))
+
+            self.__states = len(visited)
+            logging.debug(f'depth: {len(levels)}, states: {self.__states}, frontier: {len(frontier)}')
+            if self.__monitor is not None:
+                self.__monitor(self.__states, len(frontier))
+
+            goals = np.nonzero(self.__is_goal(frontier))[0]
+            if len(goals) > 0:
+                answer = list()
+                idx = goals[0]
+                for parent_idxs, codes in reversed(levels):
+                    answer.append(int(codes[idx]))
+                    idx = parent_idxs[idx]
+                answer.reverse()
+                return (len(answer), self.__solver.get_process(answer))
+
+        logging.debug(f'no answer found in {self.__states} states.')
+        return (None, None)
+
+    def get_states(self) -> int:
+        return self.__states
+
+    def get_stats(self) -> dict:
+        return {'states': self.__states, 'expanded': self.__expanded, 'peak_frontier': self.__peak_frontier}
+
+    def set_monitor(self, monitor):
+        self.__monitor = monitor
+
+    def __expand(self, frontier: np.ndarray) -> tuple:
+        # masks[n, b]: cells of block b on board n
+        masks = frontier[:, None] == self.__block_idxs[None, :, None, None]
+        occupied = (frontier != -1)[:, None]
+        children, parent_idxs, codes = list(), list(), list()
+        for d, char in enumerate(modules.solver.Solver.DIR_CHARS):
+            shifted = np.zeros_like(masks)
+            if char == 'U':
+                shifted[..., :-1, :], edge = masks[..., 1:, :], masks[..., 0, :]
+            elif char == 'D':
+                shifted[..., 1:, :], edge = masks[..., :-1, :], masks[..., -1, :]
+            elif char == 'R':
+                shifted[..., :, 1:], edge = masks[..., :, :-1], masks[..., :, -1]
+            else:
+                shifted[..., :, :-1], edge = masks[..., :, 1:], masks[..., :, 0]
+            is_movable = ~edge.any(axis=-1) & ~(shifted & ~masks & occupied).any(axis=(2, 3))
+
+            idxs, block_idxs = np.nonzero(is_movable)
+            if len(idxs) == 0:
+                continue
+            child = np.where(masks[idxs, block_idxs], np.int8(-1), frontier[idxs])
+            child = np.where(shifted[idxs, block_idxs], block_idxs.astype(np.int8)[:, None, None], child)
+            children.append(child)
+            parent_idxs.append(idxs)
+            codes.append(block_idxs * len(modules.solver.Solver.DIR_CHARS) + d)
+
+        if len(children) == 0:
+            return (frontier[:0], np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp))
+        return (np.concatenate(children), np.concatenate(parent_idxs), np.concatenate(codes))
+
+    def __get_keys(self, boards: np.ndarray) -> list:
+        # one packed row per board, two cells per byte while the canonical values fit in a nibble
+        canonical = self.__canonical_lut[boards.reshape(len(boards), -1) + 1]
+        if self.__is_packable:
+            if canonical.shape[1] % 2 == 1:
+                canonical = np.pad(canonical, ((0, 0), (0, 1)))
+            canonical = (canonical[:, 0::2] << 4) | canonical[:, 1::2]
+        canonical = np.ascontiguousarray(canonical)
+        return canonical.view(np.dtype((np.void, canonical.shape[1]))).ravel().tolist()
+
+    def __is_goal(self, boards: np.ndarray) -> np.ndarray:
+        return np.all(boards[:, self.__goal_coords[0], self.__goal_coords[1]] == self.__goal_block, axis=1)
@@ -0,0 +1,20 @@
+import logging
+from pathlib import Path
+import time
+
+import modules.config
+import modules.distance_table
+import modules.solver
+
+CONFIG_FILEPATH = str(Path(__file__).resolve().parent / 'config' / 'config.json')
+DISTANCE_TABLE_FILEPATH = str(Path(__file__).resolve().parent / 'config' / 'distances.bin')
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    config = modules.config.load(CONFIG_FILEPATH)
+    solver = modules.solver.Solver(config['board'], config['block_types'], config['goal'])
+
+    start = time.perf_counter()
+    state_num = modules.distance_table.DistanceTable.build(solver, DISTANCE_TABLE_FILEPATH)
+    logging.info(f'{state_num} states are written to {DISTANCE_TABLE_FILEPATH} in {time.perf_counter() - start:.2f}s.')
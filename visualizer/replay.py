@@ -0,0 +1,104 @@
+import argparse
+import json
+import logging
+import os
+from pathlib import Path
+import platform
+import sys
+import time
+
+# replays run headless, the dummy driver has to be chosen before pygame opens a display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+import modules.app
+import modules.trace
+
+
+def get_percentiles(values: list) -> dict:
+    values = sorted(values)
+    if len(values) == 0:
+        return {'p50': 0, 'p95': 0, 'p99': 0, 'max': 0}
+    return {
+        'p50': values[int(0.5 * (len(values) - 1))],
+        'p95': values[int(0.95 * (len(values) - 1))],
+        'p99': values[int(0.99 * (len(values) - 1))],
+        'max': values[-1],
+    }
+
+
+def replay(trace_filepath: str) -> dict:
+    # the board comes from the trace and no cache of an earlier run is used, so every replay searches the same way
+    board_info, frames = modules.trace.load(trace_filepath)
+    app = modules.app.App(board_info=board_info, use_caches=False)
+
+    frame_ms, update_ms, rect_counts, rect_areas = list(), list(), list(), list()
+    for elapsed, events in frames:
+        # the recorded session ends where it was quit, the replay keeps the process alive to report
+        if any([event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE) for event in events]):
+            break
+        app.wait()
+        start = time.perf_counter()
+        update_seconds, rect_count, rect_area = app.step(events, elapsed)
+        frame_ms.append((time.perf_counter() - start) * 1000)
+        update_ms.append(update_seconds * 1000)
+        rect_counts.append(rect_count)
+        rect_areas.append(rect_area)
+    app.close()
+
+    return {
+        'trace': Path(trace_filepath).name,
+        'frames': len(frame_ms),
+        'frame_ms': get_percentiles(frame_ms),
+        'update_ms': get_percentiles(update_ms),
+        'dirty_rects': {'mean': sum(rect_counts) / max(len(rect_counts), 1), 'max': max(rect_counts, default=0)},
+        'dirty_pixels': {'mean': sum(rect_areas) / max(len(rect_areas), 1), 'max': max(rect_areas, default=0)},
+    }
+
+
+def compare(results: list, baseline_filepath: str):
+    with open(baseline_filepath, 'r') as f:
+        baseline = {result['trace']: result for result in json.load(f)['results']}
+    for result in results:
+        old = baseline.get(result['trace'])
+        if old is None:
+            continue
+        logging.info(
+            f'{result["trace"]}: {result["frame_ms"]["p95"] / max(old["frame_ms"]["p95"], 1e-9):.2f}x p95 frame time, '
+            f'{result["update_ms"]["p95"] / max(old["update_ms"]["p95"], 1e-9):.2f}x p95 update time, '
+            f'{result["dirty_pixels"]["mean"] / max(old["dirty_pixels"]["mean"], 1e-9):.2f}x dirty pixels'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='replays input traces recorded by visualizer.py --record without a window and reports the cost of every frame.')
+    parser.add_argument('traces', nargs='+')
+    parser.add_argument('-o', '--output', help='json file the results are written to')
+    parser.add_argument('-b', '--baseline', help='json file of earlier results to compare with')
+    parser.add_argument('--budget', type=float, help='milliseconds the p95 frame time must stay within, the exit status is 1 otherwise')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    results = list()
+    for trace_filepath in args.traces:
+        results.append(replay(trace_filepath))
+        result = results[-1]
+        logging.info(
+            f'{result["trace"]}: {result["frames"]} frames, frame p50 {result["frame_ms"]["p50"]:.2f}ms p95 {result["frame_ms"]["p95"]:.2f}ms '
+            f'p99 {result["frame_ms"]["p99"]:.2f}ms max {result["frame_ms"]["max"]:.2f}ms, update p95 {result["update_ms"]["p95"]:.3f}ms, '
+            f'{result["dirty_rects"]["mean"]:.2f} dirty rects and {result["dirty_pixels"]["mean"]:.0f} dirty pixels per frame'
+        )
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(), 'results': results}, f, indent=4)
+    if args.baseline is not None:
+        compare(results, args.baseline)
+
+    over_budget = [result['trace'] for result in results if args.budget is not None and result['frame_ms']['p95'] > args.budget]
+    if len(over_budget) > 0:
+        logging.error(f'p95 frame time is over {args.budget}ms in {", ".join(over_budget)}.')
+    pygame.quit()
+    sys.exit(1 if len(over_budget) > 0 else 0)
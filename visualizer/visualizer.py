@@ -1,11 +1,22 @@
+import time
+
+# taken before anything else is imported, so the time to the first frame includes the imports
+START_TIME = time.perf_counter()
+
+import argparse
 import logging
 
 import modules.app
 
 if __name__ == '__main__':
-    logging.basicConfig(level=logging.DEBUG, format='%(levelname)s: %(message)s')
+    parser = argparse.ArgumentParser(description='plays the sliding puzzle of config/config.json.')
+    parser.add_argument('-d', '--debug', action='store_true', help='log every move, which slows down each frame')
+    parser.add_argument('-r', '--record', help='json lines file the input of every frame is recorded to, replay.py plays it back')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO, format='%(levelname)s: %(message)s')
     # logging.disable(logging.CRITICAL)
 
     logging.debug('program begins.')
-    modules.app.App().run()
+    modules.app.App(START_TIME, args.record).run()
     logging.debug('program ends.')